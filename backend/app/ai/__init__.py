@@ -1,4 +1,6 @@
 # AI package
 from app.ai.sentiment import SentimentAnalyzer
+from app.ai.registry import ModelRegistry, model_registry
+from app.ai.preprocessing import Preprocessor, preprocessing_metrics
 
-__all__ = ["SentimentAnalyzer"]
+__all__ = ["SentimentAnalyzer", "ModelRegistry", "model_registry", "Preprocessor", "preprocessing_metrics"]
@@ -0,0 +1,52 @@
+import re
+from typing import Optional
+
+
+# Scripts that identify a language (or a single dominant one) on their own
+SCRIPT_LANGUAGES = [
+    (re.compile(r"[؀-ۿݐ-ݿࢠ-ࣿ]"), "ar"),
+    (re.compile(r"[֐-׿]"), "he"),
+    (re.compile(r"[Ѐ-ӿ]"), "ru"),
+    (re.compile(r"[Ͱ-Ͽ]"), "el"),
+    (re.compile(r"[぀-ヿ]"), "ja"),
+    (re.compile(r"[가-힯]"), "ko"),
+    (re.compile(r"[一-鿿]"), "zh"),
+    (re.compile(r"[฀-๿]"), "th"),
+    (re.compile(r"[ऀ-ॿ]"), "hi"),
+]
+
+# Frequent function words for Latin-script languages
+STOPWORDS = {
+    "en": {"the", "and", "is", "are", "was", "this", "that", "with", "for", "not", "you", "it", "very", "of"},
+    "fr": {"le", "la", "les", "et", "est", "une", "des", "pas", "pour", "que", "très", "avec", "c'est", "je"},
+    "es": {"el", "los", "las", "y", "es", "una", "por", "que", "muy", "con", "para", "pero", "no", "lo"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "ein", "eine", "sehr", "mit", "für", "ich", "es", "zu"},
+    "it": {"il", "lo", "gli", "e", "è", "una", "non", "per", "che", "molto", "con", "sono", "di", "della"},
+    "pt": {"o", "os", "as", "e", "é", "uma", "não", "para", "que", "muito", "com", "mas", "do", "da"},
+}
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Guess the language of a comment with cheap heuristics.
+    
+    Non-Latin scripts map directly to a language; Latin-script text is
+    matched against short stopword lists. Returns None when unsure.
+    """
+    for pattern, language in SCRIPT_LANGUAGES:
+        if pattern.search(text):
+            return language
+    
+    words = [word.lower() for word in WORD_PATTERN.findall(text)]
+    if not words:
+        return None
+    
+    best_language, best_hits = None, 0
+    for language, stopwords in STOPWORDS.items():
+        hits = sum(1 for word in words if word in stopwords)
+        if hits > best_hits:
+            best_language, best_hits = language, hits
+    
+    return best_language
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.config import settings
+
+
+class Chunk(NamedTuple):
+    """Token IDs (with special tokens) of one model input window of a text."""
+    text_index: int
+    input_ids: List[int]
+
+
+class PreprocessingMetrics:
+    """
+    Counters for tokenization cost and padding waste.
+    
+    Padding waste is the share of padded positions in the batches sent
+    to the model that are padding rather than real tokens.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.texts = 0
+            self.chunks = 0
+            self.chunked_texts = 0
+            self.truncated_texts = 0
+            self.tokenize_seconds = 0.0
+            self.batches = 0
+            self.tokens = 0
+            self.padded_tokens = 0
+    
+    def record_tokenization(self, texts: int, chunks: int, chunked: int, truncated: int, seconds: float) -> None:
+        with self._lock:
+            self.texts += texts
+            self.chunks += chunks
+            self.chunked_texts += chunked
+            self.truncated_texts += truncated
+            self.tokenize_seconds += seconds
+    
+    def record_batch(self, tokens: int, padded_tokens: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.tokens += tokens
+            self.padded_tokens += padded_tokens
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "texts": self.texts,
+                "chunks": self.chunks,
+                "chunked_texts": self.chunked_texts,
+                "truncated_texts": self.truncated_texts,
+                "tokenize_seconds": self.tokenize_seconds,
+                "tokenize_ms_per_text": self.tokenize_seconds * 1000 / self.texts if self.texts else None,
+                "batches": self.batches,
+                "tokens": self.tokens,
+                "padded_tokens": self.padded_tokens,
+                "padding_waste": 1 - self.tokens / self.padded_tokens if self.padded_tokens else None,
+            }
+
+
+preprocessing_metrics = PreprocessingMetrics()
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _tokenizer_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for tokenization (fast tokenizers release the GIL)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            threads = settings.PREPROCESSING_THREADS or min(4, os.cpu_count() or 1)
+            _pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="tokenize")
+        return _pool
+
+
+def supports_tokenizer(tokenizer) -> bool:
+    """Whether a tokenizer can be used by Preprocessor (only fast tokenizers can)."""
+    return tokenizer is not None and getattr(tokenizer, "is_fast", False)
+
+
+class Preprocessor:
+    """
+    Token-aware preprocessing of cleaned comments for a sequence classifier.
+    
+    Texts are tokenized once, in shards across threads. A text that fits
+    the model becomes one chunk; a longer one is split into overlapping
+    windows of max_length tokens (at most max_chunks, the rest is
+    truncated). Chunks are then sorted by length and padded per batch, so
+    batches carry as little padding as possible.
+    """
+    
+    def __init__(
+        self,
+        tokenizer,
+        max_length: Optional[int] = None,
+        stride: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+        shard_size: int = 256,
+        metrics: Optional[PreprocessingMetrics] = None
+    ):
+        """
+        Args:
+            tokenizer: A fast (Rust-backed) HuggingFace tokenizer
+            max_length: Tokens per model input, special tokens included
+                (defaults to SENTIMENT_MAX_TOKENS, capped by the tokenizer)
+            stride: Tokens shared by consecutive chunks (defaults to SENTIMENT_CHUNK_STRIDE)
+            max_chunks: Chunks kept per text (defaults to SENTIMENT_MAX_CHUNKS)
+            shard_size: Texts tokenized per thread task
+            metrics: Where to record metrics (defaults to the shared preprocessing_metrics)
+        
+        Raises:
+            ValueError: If the stride leaves no room for new tokens in a chunk
+        """
+        self.tokenizer = tokenizer
+        self.max_length = min(max_length or settings.SENTIMENT_MAX_TOKENS, tokenizer.model_max_length)
+        self.window = self.max_length - tokenizer.num_special_tokens_to_add(pair=False)
+        self.stride = settings.SENTIMENT_CHUNK_STRIDE if stride is None else stride
+        self.max_chunks = max_chunks or settings.SENTIMENT_MAX_CHUNKS
+        self.shard_size = shard_size
+        self.metrics = metrics or preprocessing_metrics
+        
+        if not 0 <= self.stride < self.window:
+            raise ValueError(f"Chunk stride must be between 0 and {self.window - 1} tokens")
+    
+    def _encode(self, texts: List[str]) -> List[List[int]]:
+        # No truncation or padding, so the shared tokenizer's settings are
+        # left alone and concurrent calls are safe
+        return self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            truncation=False,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )["input_ids"]
+    
+    def _windows(self, ids: List[int]) -> Tuple[List[List[int]], bool]:
+        """Split token IDs into overlapping windows; returns (windows, truncated)."""
+        if len(ids) <= self.window:
+            return [ids], False
+        
+        step = self.window - self.stride
+        starts = range(0, len(ids) - self.stride, step)
+        windows = [ids[start:start + self.window] for start in starts]
+        return windows[:self.max_chunks], len(windows) > self.max_chunks
+    
+    def tokenize(self, texts: Sequence[str]) -> List[Chunk]:
+        """Tokenize texts into model input chunks, in text order."""
+        started = time.perf_counter()
+        
+        texts = list(texts)
+        shards = [texts[i:i + self.shard_size] for i in range(0, len(texts), self.shard_size)]
+        if len(shards) > 1:
+            encoded = [ids for shard in _tokenizer_pool().map(self._encode, shards) for ids in shard]
+        else:
+            encoded = [ids for shard in shards for ids in self._encode(shard)]
+        
+        chunks = []
+        chunked = truncated = 0
+        for index, ids in enumerate(encoded):
+            windows, was_truncated = self._windows(ids)
+            chunked += len(windows) > 1
+            truncated += was_truncated
+            for window in windows:
+                chunks.append(Chunk(index, self.tokenizer.build_inputs_with_special_tokens(window)))
+        
+        self.metrics.record_tokenization(
+            len(texts), len(chunks), chunked, truncated, time.perf_counter() - started
+        )
+        return chunks
+    
+    @staticmethod
+    def group(chunks: List[Chunk], batch_size: int) -> Iterator[List[Chunk]]:
+        """Split chunks into batches of similar length, shortest first."""
+        ordered = sorted(chunks, key=lambda chunk: len(chunk.input_ids))
+        for start in range(0, len(ordered), batch_size):
+            yield ordered[start:start + batch_size]
+    
+    def batches(self, chunks: List[Chunk], batch_size: int) -> Iterator[Tuple[List[Chunk], Dict]]:
+        """
+        Group chunks of similar length into padded tensor batches.
+        
+        Yields:
+            (chunks, inputs) pairs, where inputs holds the input_ids and
+            attention_mask tensors of those chunks
+        """
+        import torch
+        
+        pad_id = self.tokenizer.pad_token_id or 0
+        
+        for batch in self.group(chunks, batch_size):
+            width = len(batch[-1].input_ids)
+            input_ids = torch.full((len(batch), width), pad_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+            for row, chunk in enumerate(batch):
+                input_ids[row, :len(chunk.input_ids)] = torch.tensor(chunk.input_ids, dtype=torch.long)
+                attention_mask[row, :len(chunk.input_ids)] = 1
+            
+            tokens = sum(len(chunk.input_ids) for chunk in batch)
+            self.metrics.record_batch(tokens, len(batch) * width)
+            yield batch, {"input_ids": input_ids, "attention_mask": attention_mask}
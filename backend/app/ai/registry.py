@@ -0,0 +1,297 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "default"
+
+
+class ModelSpec:
+    """A named model and the tokenizer it uses."""
+    
+    def __init__(self, name: str, model_id: str, tokenizer_id: Optional[str] = None):
+        self.name = name
+        self.model_id = model_id
+        self.tokenizer_id = tokenizer_id or model_id
+
+
+class LoadedModel:
+    """A model resident in memory, ready for inference."""
+    
+    def __init__(
+        self,
+        name: str,
+        model_id: str,
+        version: str,
+        pipeline,
+        memory_bytes: int = 0,
+        tokenizer_id: Optional[str] = None
+    ):
+        self.name = name
+        self.model_id = model_id
+        self.version = version
+        self.pipeline = pipeline
+        self.memory_bytes = memory_bytes
+        self.tokenizer_id = tokenizer_id or model_id
+        self.loaded_at = time.time()
+        self.last_used_at = self.loaded_at
+        self.uses = 0
+
+
+def parse_model_specs(default_model: str, extra_models: str) -> Dict[str, ModelSpec]:
+    """
+    Parse model settings into specs.
+    
+    extra_models is a comma-separated list of `name=model_id` entries,
+    optionally with a tokenizer: `name=model_id|tokenizer_id`.
+    """
+    specs = {DEFAULT_MODEL_NAME: ModelSpec(DEFAULT_MODEL_NAME, default_model)}
+    
+    for entry in extra_models.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, source = entry.partition("=")
+        model_id, _, tokenizer_id = source.partition("|")
+        if not name.strip() or not model_id.strip():
+            raise ValueError(f"Invalid SENTIMENT_MODELS entry: {entry}")
+        specs[name.strip()] = ModelSpec(name.strip(), model_id.strip(), tokenizer_id.strip() or None)
+    
+    return specs
+
+
+def parse_language_models(language_models: str, specs: Optional[Dict[str, ModelSpec]] = None) -> Dict[str, str]:
+    """
+    Parse `lang=model_name,...` into a language → model name mapping.
+    
+    Raises:
+        ValueError: If an entry is malformed or names a model missing from specs
+    """
+    mapping = {}
+    for entry in language_models.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        language, _, name = entry.partition("=")
+        if not language.strip() or not name.strip():
+            raise ValueError(f"Invalid SENTIMENT_LANGUAGE_MODELS entry: {entry}")
+        if specs is not None and name.strip() not in specs:
+            raise ValueError(f"SENTIMENT_LANGUAGE_MODELS entry {entry} names an unknown model")
+        mapping[language.strip().lower()] = name.strip()
+    return mapping
+
+
+def _model_memory_bytes(model) -> int:
+    """Resident size of a torch model's parameters and buffers."""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """
+    Serves several named sentiment models within a memory budget.
+    
+    Models load on first use. When the resident models exceed the budget,
+    the least recently used ones are evicted. Models configured with the
+    same tokenizer share one tokenizer instance.
+    
+    Loading happens outside the registry lock, so requests for resident
+    models are never held up by a slow load; concurrent requests for the
+    same model wait for a single load.
+    """
+    
+    def __init__(self, specs: Dict[str, ModelSpec], memory_budget_bytes: int):
+        self.specs = specs
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._tokenizers: Dict[str, object] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+    
+    @classmethod
+    def from_settings(cls) -> "ModelRegistry":
+        """
+        Create the registry from settings.
+        
+        Raises:
+            ValueError: If SENTIMENT_MODELS or SENTIMENT_LANGUAGE_MODELS is
+                invalid, so misconfiguration fails at startup
+        """
+        specs = parse_model_specs(settings.SENTIMENT_MODEL, settings.SENTIMENT_MODELS)
+        parse_language_models(settings.SENTIMENT_LANGUAGE_MODELS, specs)
+        return cls(specs, settings.MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+    
+    def names(self) -> List[str]:
+        return list(self.specs)
+    
+    def has(self, name: str) -> bool:
+        return name in self.specs
+    
+    @property
+    def resident_bytes(self) -> int:
+        return sum(model.memory_bytes for model in self._models.values())
+    
+    def get(self, name: Optional[str] = None) -> LoadedModel:
+        """
+        Get a model by name, loading it if needed.
+        
+        Raises:
+            ValueError: If no model with that name is configured
+        """
+        name = name or DEFAULT_MODEL_NAME
+        if name not in self.specs:
+            raise ValueError(f"Unknown sentiment model: {name}")
+        
+        model = self._resident(name)
+        if model is not None:
+            return model
+        
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        
+        with load_lock:
+            # Another request may have loaded it while this one waited
+            model = self._resident(name)
+            if model is not None:
+                return model
+            
+            model = self._load(self.specs[name])
+            
+            with self._lock:
+                self.loads += 1
+                self._models[name] = model
+                tokenizer = getattr(model.pipeline, "tokenizer", None)
+                if tokenizer is not None:
+                    self._tokenizers.setdefault(model.tokenizer_id, tokenizer)
+                self._evict_over_budget(keep=name)
+                return self._use(model)
+    
+    def _resident(self, name: str) -> Optional[LoadedModel]:
+        """Get a resident model and mark it as most recently used."""
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                return None
+            self._models.move_to_end(name)
+            return self._use(model)
+    
+    def _use(self, model: LoadedModel) -> LoadedModel:
+        model.last_used_at = time.time()
+        model.uses += 1
+        return model
+    
+    def _tokenizer(self, tokenizer_id: str):
+        """
+        Get the shared tokenizer of a resident model, or load a new one.
+        
+        A loaded tokenizer is only shared once its model is resident (see get).
+        """
+        with self._lock:
+            tokenizer = self._tokenizers.get(tokenizer_id)
+        if tokenizer is None:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(tokenizer_id)
+        return tokenizer
+    
+    def _load(self, spec: ModelSpec) -> LoadedModel:
+        from transformers import AutoModelForSequenceClassification, pipeline
+        
+        started = time.perf_counter()
+        tokenizer = self._tokenizer(spec.tokenizer_id)
+        model = AutoModelForSequenceClassification.from_pretrained(spec.model_id)
+        model.eval()
+        
+        loaded = LoadedModel(
+            name=spec.name,
+            model_id=spec.model_id,
+            version=getattr(model.config, "_commit_hash", None) or "unknown",
+            pipeline=pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, top_k=None),
+            memory_bytes=_model_memory_bytes(model),
+            tokenizer_id=spec.tokenizer_id
+        )
+        logger.info(
+            "Loaded sentiment model %s (%s@%s) in %.1fs, %.0f MB resident",
+            spec.name, spec.model_id, loaded.version,
+            time.perf_counter() - started, loaded.memory_bytes / 1024 / 1024
+        )
+        return loaded
+    
+    def _evict_over_budget(self, keep: str) -> None:
+        """Evict least recently used models until the budget is met."""
+        for name in list(self._models):
+            if self.resident_bytes <= self.memory_budget_bytes:
+                break
+            if name != keep:
+                self.evict(name)
+        
+        if self.resident_bytes > self.memory_budget_bytes:
+            logger.warning(
+                "Sentiment model %s alone exceeds MODEL_MEMORY_BUDGET_MB (%.0f MB resident)",
+                keep, self.resident_bytes / 1024 / 1024
+            )
+    
+    def evict(self, name: str) -> bool:
+        """
+        Drop a model from memory. In-flight requests keep their reference
+        until they finish.
+        
+        Returns:
+            True if the model was resident
+        """
+        with self._lock:
+            model = self._models.pop(name, None)
+            if model is None:
+                return False
+            
+            # Drop the tokenizer once no resident model uses it
+            if all(m.tokenizer_id != model.tokenizer_id for m in self._models.values()):
+                self._tokenizers.pop(model.tokenizer_id, None)
+            
+            self.evictions += 1
+            logger.info(
+                "Evicted sentiment model %s (%s), freed %.0f MB",
+                name, model.model_id, model.memory_bytes / 1024 / 1024
+            )
+            return True
+    
+    def stats(self) -> Dict:
+        """Snapshot of configured and resident models, for monitoring."""
+        with self._lock:
+            resident = [
+                {
+                    "name": model.name,
+                    "model_id": model.model_id,
+                    "version": model.version,
+                    "memory_bytes": model.memory_bytes,
+                    "loaded_at": datetime.fromtimestamp(model.loaded_at, timezone.utc),
+                    "last_used_at": datetime.fromtimestamp(model.last_used_at, timezone.utc),
+                    "uses": model.uses,
+                }
+                for model in self._models.values()
+            ]
+            return {
+                "configured": [
+                    {"name": spec.name, "model_id": spec.model_id, "tokenizer_id": spec.tokenizer_id}
+                    for spec in self.specs.values()
+                ],
+                "resident": resident,
+                "resident_bytes": self.resident_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "shared_tokenizers": len(self._tokenizers),
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+
+model_registry = ModelRegistry.from_settings()
@@ -1,6 +1,8 @@
-from typing import List, Dict
-from transformers import pipeline
+from typing import List, Dict, Optional
 from app.config import settings
+from app.ai.language import detect_language
+from app.ai.preprocessing import Preprocessor, supports_tokenizer
+from app.ai.registry import LoadedModel, model_registry, parse_language_models
 
 
 class SentimentAnalyzer:
@@ -8,30 +10,45 @@ class SentimentAnalyzer:
     BERT-based sentiment analyzer using HuggingFace Transformers.
     Uses nlptown/bert-base-multilingual-uncased-sentiment model
     which supports multiple languages including English, French, and Arabic.
+    
+    Models are served by the shared model registry. An analyzer either
+    uses one named model, or (without a name) picks a model per text from
+    SENTIMENT_LANGUAGE_MODELS, falling back to the default model.
+    
+    Texts go through the token-aware Preprocessor and are fed to the model
+    as length-grouped tensors; models without a fast tokenizer are called
+    through their pipeline instead.
     """
     
-    _instance = None
-    _pipeline = None
+    def __init__(self, model_name: Optional[str] = None):
+        """
+        Args:
+            model_name: Registry model to use for every text
     
-    def __new__(cls):
-        """Singleton pattern to avoid loading model multiple times."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        Raises:
+            ValueError: If no model with that name is configured
+        """
+        if model_name is not None and not model_registry.has(model_name):
+            raise ValueError(f"Unknown sentiment model: {model_name}")
+        self.model_name = model_name
+        self.language_models = {} if model_name else parse_language_models(
+            settings.SENTIMENT_LANGUAGE_MODELS, model_registry.specs
+        )
     
-    def __init__(self):
-        """Initialize the sentiment analysis pipeline."""
-        if SentimentAnalyzer._pipeline is None:
-            SentimentAnalyzer._pipeline = pipeline(
-                "sentiment-analysis",
-                model=settings.SENTIMENT_MODEL,
-                top_k=None  # Return all scores
-            )
+    def _load(self, model_name: Optional[str]) -> LoadedModel:
+        """Get a model from the registry, loading it if needed."""
+        return model_registry.get(model_name)
     
     @property
     def pipeline(self):
-        """Get the sentiment pipeline."""
-        return SentimentAnalyzer._pipeline
+        """Get the sentiment pipeline of this analyzer's model."""
+        return self._load(self.model_name).pipeline
+    
+    def _route(self, text: str) -> Optional[str]:
+        """Choose the model name for a text (None means the default model)."""
+        if self.model_name or not self.language_models:
+            return self.model_name
+        return self.language_models.get(detect_language(text))
     
     def _map_stars_to_sentiment(self, label: str, score: float) -> Dict:
         """
@@ -59,60 +76,148 @@ class SentimentAnalyzer:
             "raw_label": label
         }
     
-    def analyze(self, text: str) -> Dict:
+    def _neutral_result(self, error: Optional[str] = None) -> Dict:
+        """Result used for empty texts and on errors."""
+        result = {
+            "sentiment": "neutral",
+            "score": 3.0,
+            "confidence": 0.0,
+            "raw_label": "3 stars",
+            "model": None,
+            "model_version": None
+        }
+        if error is not None:
+            result["error"] = error
+        return result
+    
+    def _best_result(self, results: List, model: LoadedModel) -> Dict:
+        """Map the highest scoring label of one pipeline output to a sentiment."""
+        # Handle nested list result
+        if isinstance(results[0], list):
+            results = results[0]
+        
+        # Find the highest scoring prediction
+        best_result = max(results, key=lambda x: x['score'])
+        
+        result = self._map_stars_to_sentiment(best_result['label'], best_result['score'])
+        result["model"] = model.name
+        result["model_version"] = model.version
+        return result
+    
+    def _tokenized(self, model: LoadedModel) -> bool:
+        """Whether a model can take pre-tokenized input."""
+        return supports_tokenizer(getattr(model.pipeline, "tokenizer", None)) and \
+            getattr(model.pipeline, "model", None) is not None
+    
+    def _predict(self, model: LoadedModel, inputs: Dict) -> List[List[float]]:
+        """Run the model on a tensor batch; returns label probabilities per row."""
+        import torch
+        
+        classifier = model.pipeline.model
+        inputs = {name: tensor.to(classifier.device) for name, tensor in inputs.items()}
+        with torch.no_grad():
+            logits = classifier(**inputs).logits
+        return torch.softmax(logits.float(), dim=-1).cpu().tolist()
+    
+    def _score_tokenized(self, model: LoadedModel, texts: List[str], batch_size: int) -> List[Dict]:
         """
-        Analyze sentiment of a single text.
+        Score texts from pre-tokenized chunks.
         
-        Args:
-            text: The text to analyze
-            
-        Returns:
-            Dict with sentiment, score, confidence, and raw_label
+        The label probabilities of a text's chunks are averaged, weighted
+        by chunk length, before picking its label.
         """
-        if not text or not text.strip():
-            return {
-                "sentiment": "neutral",
-                "score": 3.0,
-                "confidence": 0.0,
-                "raw_label": "3 stars"
-            }
+        preprocessor = Preprocessor(model.pipeline.tokenizer)
+        id2label = model.pipeline.model.config.id2label
         
-        # Truncate long texts (model max length)
-        text = text[:512]
+        totals: List[Optional[List[float]]] = [None] * len(texts)
+        weights = [0] * len(texts)
+        for chunks, inputs in preprocessor.batches(preprocessor.tokenize(texts), batch_size):
+            for chunk, probabilities in zip(chunks, self._predict(model, inputs)):
+                weight = len(chunk.input_ids)
+                total = totals[chunk.text_index]
+                if total is None:
+                    totals[chunk.text_index] = [p * weight for p in probabilities]
+                else:
+                    totals[chunk.text_index] = [t + p * weight for t, p in zip(total, probabilities)]
+                weights[chunk.text_index] += weight
         
+        results = []
+        for total, weight in zip(totals, weights):
+            best = max(range(len(total)), key=total.__getitem__)
+            result = self._map_stars_to_sentiment(id2label[best], total[best] / weight)
+            result["model"] = model.name
+            result["model_version"] = model.version
+            results.append(result)
+        return results
+    
+    def _analyze_with(self, model: LoadedModel, text: str) -> Dict:
         try:
+            if self._tokenized(model):
+                return self._score_tokenized(model, [text], 1)[0]
             # Get predictions - returns list of dicts for each label
-            results = self.pipeline(text)
-            
-            # Handle nested list result
-            if isinstance(results[0], list):
-                results = results[0]
-            
-            # Find the highest scoring prediction
-            best_result = max(results, key=lambda x: x['score'])
-            
-            return self._map_stars_to_sentiment(best_result['label'], best_result['score'])
+            return self._best_result(model.pipeline(text, truncation=True), model)
         except Exception as e:
             # Return neutral on error
-            return {
-                "sentiment": "neutral",
-                "score": 3.0,
-                "confidence": 0.0,
-                "raw_label": "3 stars",
-                "error": str(e)
-            }
-    
-    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+            return self._neutral_result(str(e))
+    
+    def analyze(self, text: str) -> Dict:
+        """
+        Analyze sentiment of a single text.
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            Dict with sentiment, score, confidence, raw_label, and the
+            model name and version that produced it
+        """
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
         """
         Analyze sentiment of multiple texts.
         
+        Texts are grouped by model and sent to it in batches. Long texts are
+        scored in overlapping token chunks rather than cut off. If a batch
+        fails, its texts are analyzed one by one so a single bad text only
+        affects its own result.
+        
         Args:
             texts: List of texts to analyze
+            batch_size: Texts per model call (defaults to SENTIMENT_BATCH_SIZE)
             
         Returns:
-            List of sentiment results
+            List of sentiment results, in the same order as texts
         """
-        results = []
-        for text in texts:
-            results.append(self.analyze(text))
+        batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+        results: List[Optional[Dict]] = [None] * len(texts)
+        
+        groups: Dict[Optional[str], List] = {}
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                results[index] = self._neutral_result()
+            else:
+                groups.setdefault(self._route(text), []).append((index, text))
+        
+        for model_name, pending in groups.items():
+            model = self._load(model_name)
+            tokenized = self._tokenized(model)
+            # Tokenized texts are handled in larger groups, so that batches
+            # can be formed from chunks of similar length
+            group_size = batch_size * 32 if tokenized else batch_size
+            for start in range(0, len(pending), group_size):
+                group = pending[start:start + group_size]
+                group_texts = [text for _, text in group]
+                try:
+                    if tokenized:
+                        scored = self._score_tokenized(model, group_texts, batch_size)
+                    else:
+                        outputs = model.pipeline(group_texts, batch_size=batch_size, truncation=True)
+                        scored = [self._best_result(output, model) for output in outputs]
+                    for (index, _), result in zip(group, scored):
+                        results[index] = result
+                except Exception:
+                    for index, text in group:
+                        results[index] = self._analyze_with(model, text)
+        
         return results
@@ -1,4 +1,8 @@
 # API package
 from app.api.analysis import router as analysis_router
+from app.api.admin import router as admin_router
+from app.api.export import router as export_router
+from app.api.search import router as search_router
+from app.api.stats import router as stats_router
 
-__all__ = ["analysis_router"]
+__all__ = ["analysis_router", "admin_router", "export_router", "search_router", "stats_router"]
@@ -0,0 +1,117 @@
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.ai.preprocessing import preprocessing_metrics
+from app.ai.registry import model_registry
+from app.config import settings
+from app.schemas.admin import ModelRegistryStats, PreprocessingStats, ProfileSummary
+from app.services.profiling import profile_store
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(default=None)):
+    """Dependency that checks the X-Admin-Key header against ADMIN_API_KEY."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled"
+        )
+    
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin key"
+        )
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_key)]
+)
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+def list_profiles():
+    """
+    List stored request profiles, newest first.
+    
+    Profiles are recorded for `POST /analyses` requests when
+    PROFILING_ENABLED is set and the request carries the profiling header.
+    """
+    return profile_store.list_profiles()
+
+
+@router.get("/profiles/{analysis_id}")
+def get_profile(
+    analysis_id: int,
+    format: str = "text",
+    sort: str = "cumulative",
+    limit: int = 50
+):
+    """
+    Get the profile recorded for an analysis.
+    
+    - **format**: `text` for a pstats report, `pstats` for the raw dump
+      (loadable with `pstats.Stats` or snakeviz)
+    - **sort**: pstats sort key used by the text report
+    - **limit**: Maximum number of functions in the text report
+    """
+    if format == "pstats":
+        path = profile_store.get_path(analysis_id)
+        if path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+        return FileResponse(
+            path,
+            media_type="application/octet-stream",
+            filename=f"analysis-{analysis_id}.pstats"
+        )
+    
+    if format != "text":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'text' or 'pstats'"
+        )
+    
+    try:
+        report = profile_store.render_text(analysis_id, sort=sort, limit=limit)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort key: {sort}"
+        )
+    
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    return PlainTextResponse(report)
+
+
+@router.get("/models", response_model=ModelRegistryStats)
+def list_models():
+    """
+    Get the configured sentiment models and the ones resident in memory.
+    
+    Models load on first use and the least recently used ones are evicted
+    when the resident models exceed MODEL_MEMORY_BUDGET_MB.
+    """
+    return model_registry.stats()
+
+
+@router.get("/preprocessing", response_model=PreprocessingStats)
+def get_preprocessing_stats():
+    """
+    Get tokenization metrics since the process started.
+    
+    Reports the time spent tokenizing, how many comments were split into
+    chunks or truncated, and the share of padding in the batches sent to
+    the models (`padding_waste`).
+    """
+    return preprocessing_metrics.snapshot()
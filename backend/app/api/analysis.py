@@ -1,40 +1,87 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-from app.database import get_db
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.limiter import limiter, analysis_rate_limit
 from app.schemas.analysis import AnalysisCreate, AnalysisResponse, AnalysisListResponse
+from app.services.admission import AdmissionRejected, analysis_executor
 from app.services.analysis import AnalysisService
+from app.services.profiling import should_profile, profile_call, profile_store
+from app.services.response_cache import analysis_response_cache, etag_matches
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analyses", tags=["Analysis"])
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+
+def _run_analysis(post_url: str, model_name: Optional[str], profile: bool):
+    """
+    Blocking part of analyze_post, run on the analysis executor.
+    
+    The response is built here too, so loading the comments does not
+    block the event loop. The session is opened and closed on the worker
+    thread: a request that stops waiting (e.g. on shutdown) must not close
+    a session the worker is still using.
+    """
+    db = SessionLocal()
+    try:
+        service = AnalysisService(db)
+        analysis, profiler = profile_call(profile, service.analyze_post, post_url, model_name)
+        if profiler is not None:
+            try:
+                profile_store.save(analysis.id, profiler)
+            except Exception:
+                # A profile is a debugging aid; never fail the analysis over it
+                logger.warning("Could not save the profile of analysis %s", analysis.id, exc_info=True)
+        return AnalysisResponse.model_validate(analysis)
+    finally:
+        db.close()
 
 
 @router.post("", response_model=AnalysisResponse, status_code=status.HTTP_201_CREATED)
+@limiter.limit(analysis_rate_limit)
 async def analyze_post(
-    analysis_data: AnalysisCreate,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    analysis_data: AnalysisCreate
 ):
     """
     Analyze sentiment of comments on a Facebook post.
     
     - **facebook_post_url**: The URL of the Facebook post to analyze
+    - **model**: Optional registry model name (see `/admin/models`); by
+      default the model is chosen per comment language
     
     This endpoint will:
     1. Extract comments from the post
     2. Run BERT sentiment analysis on each comment
     3. Calculate overall sentiment statistics
     4. Store results in the database
-    """
-    service = AnalysisService(db)
     
+    Requests are limited to RATE_LIMIT_PER_MINUTE per client (429), and to
+    ANALYSIS_MAX_CONCURRENCY running plus ANALYSIS_MAX_QUEUE waiting
+    analyses per worker (503). Both responses carry `Retry-After`.
+    
+    When profiling is enabled, sending the profiling header (`X-Profile: 1`
+    by default) records a profile retrievable from `/admin/profiles`.
+    """
     try:
-        analysis = service.analyze_post(analysis_data.facebook_post_url)
+        analysis = await analysis_executor.run(
+            _run_analysis,
+            analysis_data.facebook_post_url,
+            analysis_data.model,
+            should_profile(request.headers)
+        )
         return analysis
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,7 +95,7 @@ async def analyze_post(
 
 
 @router.get("", response_model=List[AnalysisListResponse])
-async def get_analyses(
+def get_analyses(
     skip: int = 0,
     limit: int = 50,
     db: Session = Depends(get_db)
@@ -65,22 +112,42 @@ async def get_analyses(
 
 
 @router.get("/{analysis_id}", response_model=AnalysisResponse)
-async def get_analysis(
+def get_analysis(
     analysis_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get a specific analysis by ID.
     
     - **analysis_id**: The ID of the analysis to retrieve
+    
+    Analyses never change once stored, so responses carry a strong `ETag`
+    and a long-lived `Cache-Control`, and `If-None-Match` is answered with
+    304. Serialized bodies are kept in an in-process LRU cache.
+    
+    Analyses past the retention period are served from the archive files.
     """
-    service = AnalysisService(db)
-    analysis = service.get_analysis_by_id(analysis_id)
+    cached = analysis_response_cache.get(analysis_id)
     
-    if not analysis:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Analysis not found"
-        )
+    if cached is None:
+        service = AnalysisService(db)
+        body = service.get_analysis_json(analysis_id)
+        
+        if body is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis not found"
+            )
+        
+        cached = analysis_response_cache.put(analysis_id, body)
+    
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"private, max-age={settings.ANALYSIS_CACHE_MAX_AGE}, immutable",
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return analysis
+    return Response(content=cached.body, media_type="application/json", headers=headers)
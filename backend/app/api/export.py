@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.export import EXPORT_FORMATS, EXPORT_COMPRESSIONS, ExportService, stream_export
+
+router = APIRouter(prefix="/exports", tags=["Export"])
+
+
+def _export_response(
+    filename: str,
+    format: str,
+    compression: str,
+    **filters
+) -> StreamingResponse:
+    """Validate export options and build the streaming response."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if compression not in EXPORT_COMPRESSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"compression must be one of: {', '.join(EXPORT_COMPRESSIONS)}"
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"{filename}.{extension}"
+    
+    # Parquet uses the compression as its column codec; other formats are
+    # compressed as a whole stream.
+    if format != "parquet" and EXPORT_COMPRESSIONS[compression]:
+        media_type, compressed_extension = EXPORT_COMPRESSIONS[compression]
+        filename = f"{filename}.{compressed_extension}"
+    
+    return StreamingResponse(
+        stream_export(format, compression, **filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/analyses")
+def export_analyses(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    format: str = "csv",
+    compression: str = "none"
+):
+    """
+    Export comments of all analyses created in a date range.
+    
+    - **start**: Include analyses created at or after this time
+    - **end**: Include analyses created before this time
+    - **format**: `csv`, `ndjson` or `parquet`
+    - **compression**: `none`, `gzip` or `zstd`
+    
+    One row per comment, streamed with constant memory.
+    """
+    return _export_response("analyses", format, compression, start=start, end=end)
+
+
+@router.get("/analyses/{analysis_id}")
+def export_analysis(
+    analysis_id: int,
+    format: str = "csv",
+    compression: str = "none",
+    db: Session = Depends(get_db)
+):
+    """
+    Export the comments of one analysis.
+    
+    - **analysis_id**: The ID of the analysis to export
+    - **format**: `csv`, `ndjson` or `parquet`
+    - **compression**: `none`, `gzip` or `zstd`
+    """
+    if not ExportService(db).analysis_exists(analysis_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    
+    return _export_response(
+        f"analysis-{analysis_id}", format, compression, analysis_id=analysis_id
+    )
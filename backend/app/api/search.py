@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.search import CommentSearchResponse
+from app.services.search import SearchService
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/comments", response_model=CommentSearchResponse)
+def search_comments(
+    q: str,
+    sentiment: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over stored comments, most relevant first.
+    
+    - **q**: Words that must all appear in the comment
+    - **sentiment**: `positive`, `neutral` or `negative`
+    - **min_score** / **max_score**: Star score range (1-5)
+    - **start** / **end**: Analysis creation date range
+    - **limit**: Maximum number of results per page
+    - **cursor**: `next_cursor` from the previous page
+    """
+    service = SearchService(db)
+    
+    try:
+        results, next_cursor = service.search_comments(
+            q,
+            sentiment=sentiment,
+            min_score=min_score,
+            max_score=max_score,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {"results": results, "next_cursor": next_cursor}
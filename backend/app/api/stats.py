@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.stats import TrendResponse, TopEntry
+from app.services.rollup import RollupService
+
+router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+
+@router.get("/trend", response_model=TrendResponse)
+def get_trend(
+    scope: str,
+    key: str,
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the sentiment trend of a page or post over time.
+    
+    - **scope**: `page` or `post`
+    - **key**: Page name/ID, or the post URL
+    - **granularity**: `hour` or `day`
+    - **start** / **end**: Bucket time range (UTC)
+    - **user_id**: Only include analyses of this user
+    
+    Served from precomputed rollups.
+    """
+    service = RollupService(db)
+    
+    try:
+        points = service.trend(scope, key, granularity, start=start, end=end, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {"scope": scope, "key": key, "granularity": granularity, "points": points}
+
+
+@router.get("/top", response_model=List[TopEntry])
+def get_top(
+    scope: str,
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    metric: str = "comment_count",
+    limit: int = Query(default=10, ge=1, le=100),
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the pages or posts with the highest totals in a time range.
+    
+    - **scope**: `page` or `post`
+    - **granularity**: Rollup granularity to read (`hour` or `day`)
+    - **start** / **end**: Bucket time range (UTC)
+    - **metric**: `analysis_count`, `comment_count`, `positive_count`,
+      `neutral_count`, `negative_count` or `score_sum`
+    - **limit**: Number of entries to return
+    - **user_id**: Only include analyses of this user
+    """
+    service = RollupService(db)
+    
+    try:
+        return service.top(
+            scope,
+            granularity,
+            start=start,
+            end=end,
+            metric=metric,
+            limit=limit,
+            user_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,161 @@
+"""
+Command-line maintenance tasks.
+
+Usage (from the backend directory):
+    python -m app.cli backfill-rollups
+    python -m app.cli score-file comments.csv scored.jsonl --workers 4
+    python -m app.cli archive --older-than-days 180
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+
+
+def backfill_rollups(args: argparse.Namespace) -> int:
+    """Rebuild the sentiment rollups from all stored analyses."""
+    from app.services.rollup import RollupService
+    
+    db = SessionLocal()
+    try:
+        processed = RollupService(db).backfill(batch_size=args.batch_size)
+    finally:
+        db.close()
+    
+    print(f"Rebuilt rollups from {processed} analyses")
+    return 0
+
+
+def score_file(args: argparse.Namespace) -> int:
+    """Score a CSV/JSONL comment file offline, optionally loading it as an analysis."""
+    from app.services.batch_scoring import BatchScoringJob, load_scored_file
+    
+    if args.load_db and not args.post_url:
+        print("--load-db requires --post-url", file=sys.stderr)
+        return 2
+    
+    job = BatchScoringJob(
+        args.input,
+        args.output,
+        text_column=args.text_column,
+        id_column=args.id_column,
+        input_format=args.input_format,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        model_name=args.model
+    )
+    
+    def report(state):
+        print(f"rows read: {state['rows_read']}, scored: {state['rows_scored']}", file=sys.stderr)
+    
+    try:
+        state = job.run(resume=args.resume, progress=report)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"Scored {state['rows_scored']} of {state['rows_read']} rows into {args.output}")
+    
+    if args.load_db and state.get("loaded_analysis_id") is not None:
+        print(f"Already stored as analysis {state['loaded_analysis_id']}, not loading again")
+    elif args.load_db:
+        init_db()
+        db = SessionLocal()
+        try:
+            analysis = load_scored_file(db, args.output, args.post_url)
+        finally:
+            db.close()
+        job.mark_loaded(analysis.id)
+        print(f"Stored as analysis {analysis.id} ({analysis.total_comments} comments)")
+    
+    return 0
+
+
+def archive(args: argparse.Namespace) -> int:
+    """Move analyses past the retention period to the archive, then reclaim the space."""
+    from app.services.retention import RetentionService
+    
+    db = SessionLocal()
+    try:
+        service = RetentionService(db, archive_dir=args.archive_dir, batch_size=args.batch_size)
+        try:
+            summary = service.archive(older_than_days=args.older_than_days)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        print(
+            f"Archived {summary['analyses']} analyses ({summary['comments']} comments) "
+            f"created before {summary['cutoff']:%Y-%m-%d %H:%M} UTC into {service.archive_dir}"
+        )
+        for part in summary["parts"]:
+            print(f"  {part}")
+        
+        if args.no_reclaim or not summary["analyses"]:
+            return 0
+        
+        reclaimed = service.reclaim(full=args.full_vacuum)
+    finally:
+        db.close()
+    
+    if reclaimed["size_before"] is not None:
+        print(
+            f"Reclaimed space: {reclaimed['size_before'] / 1024 / 1024:.1f} MB -> "
+            f"{reclaimed['size_after'] / 1024 / 1024:.1f} MB"
+        )
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    backfill = subparsers.add_parser("backfill-rollups", help="Rebuild sentiment rollups from stored analyses")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.set_defaults(func=backfill_rollups, needs_db=True)
+    
+    score = subparsers.add_parser("score-file", help="Score a CSV/JSONL comment file offline")
+    score.add_argument("input", help="Input .csv or .jsonl file")
+    score.add_argument("output", help="Output .csv or .jsonl file (a .checkpoint.json is kept next to it)")
+    score.add_argument("--text-column", default="text", help="Column/field holding the comment text")
+    score.add_argument("--id-column", default=None, help="Column/field copied to the output as id")
+    score.add_argument("--input-format", choices=["csv", "jsonl"], default=None,
+                       help="Input format (guessed from the extension by default)")
+    score.add_argument("--workers", type=int, default=1, help="Number of scoring processes")
+    score.add_argument("--threads-per-worker", type=int, default=None,
+                       help="torch threads per process (avoids oversubscribing CPUs)")
+    score.add_argument("--chunk-size", type=int, default=1024,
+                       help="Rows per work unit and checkpoint")
+    score.add_argument("--batch-size", type=int, default=settings.SENTIMENT_BATCH_SIZE,
+                       help="Texts per model call")
+    score.add_argument("--model", default=None,
+                       help="Registry model to use (default: per-language routing / default model)")
+    score.add_argument("--resume", action="store_true", help="Resume from the checkpoint")
+    score.add_argument("--load-db", action="store_true",
+                       help="Store the results as one analysis when scoring is done")
+    score.add_argument("--post-url", default=None, help="post_url of the stored analysis")
+    score.set_defaults(func=score_file, needs_db=False)
+    
+    retention = subparsers.add_parser("archive", help="Move old analyses to Parquet archive files")
+    retention.add_argument("--older-than-days", type=int, default=None,
+                           help=f"Retention period (default: RETENTION_DAYS={settings.RETENTION_DAYS})")
+    retention.add_argument("--archive-dir", default=None,
+                           help=f"Archive directory (default: ARCHIVE_DIR={settings.ARCHIVE_DIR})")
+    retention.add_argument("--batch-size", type=int, default=1000,
+                           help="Analyses deleted per transaction")
+    retention.add_argument("--no-reclaim", action="store_true",
+                           help="Skip VACUUM after archiving")
+    retention.add_argument("--full-vacuum", action="store_true",
+                           help="PostgreSQL: run VACUUM FULL (locks tables) to shrink the files")
+    retention.set_defaults(func=archive, needs_db=True)
+    
+    args = parser.parse_args(argv)
+    if args.needs_db:
+        init_db()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
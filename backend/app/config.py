@@ -10,8 +10,31 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 10
     
+    # Analysis admission control
+    ANALYSIS_MAX_CONCURRENCY: int = 2
+    ANALYSIS_MAX_QUEUE: int = 8
+    ANALYSIS_RETRY_AFTER_SECONDS: int = 30
+    
+    # Analysis read caching (analyses are immutable once written)
+    ANALYSIS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    ANALYSIS_CACHE_MAX_AGE: int = 86400
+    
     # Model Configuration
     SENTIMENT_MODEL: str = "nlptown/bert-base-multilingual-uncased-sentiment"
+    SENTIMENT_BATCH_SIZE: int = 32
+    # Extra named models: "name=model_id[|tokenizer_id],..." (SENTIMENT_MODEL is "default")
+    SENTIMENT_MODELS: str = ""
+    # Per-language model choice: "lang=model_name,..." (e.g. "ar=arabic,fr=french")
+    SENTIMENT_LANGUAGE_MODELS: str = ""
+    # Memory budget for resident models; least recently used ones are evicted
+    MODEL_MEMORY_BUDGET_MB: int = 4096
+    # Token-aware preprocessing: comments longer than SENTIMENT_MAX_TOKENS are
+    # split into chunks overlapping by SENTIMENT_CHUNK_STRIDE tokens
+    SENTIMENT_MAX_TOKENS: int = 512
+    SENTIMENT_CHUNK_STRIDE: int = 64
+    SENTIMENT_MAX_CHUNKS: int = 8
+    # Tokenization threads (0 = min(4, CPU count))
+    PREPROCESSING_THREADS: int = 0
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
@@ -20,6 +43,20 @@ class Settings(BaseSettings):
     FACEBOOK_ACCESS_TOKEN: str = ""
     FACEBOOK_API_VERSION: str = "v19.0"
     
+    # Admin API (disabled when empty)
+    ADMIN_API_KEY: str = ""
+    
+    # Profiling (opt-in per request via PROFILING_HEADER)
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SAMPLE_RATE: float = 1.0
+    PROFILING_DIR: str = "./profiles"
+    PROFILING_MAX_PROFILES: int = 200
+    
+    # Retention: analyses older than RETENTION_DAYS are moved to Parquet files in ARCHIVE_DIR
+    RETENTION_DAYS: int = 180
+    ARCHIVE_DIR: str = "./archive"
+    
     class Config:
         env_file = ".env"
         extra = "ignore"  # <-- ignore unknown env vars
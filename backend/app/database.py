@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateTable
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -23,3 +24,84 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def init_db(bind=None):
+    """Create database tables for all models, plus the full-text index."""
+    import app.models  # noqa: F401  (register models on Base)
+    from app.services.search import init_search_index
+    
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    add_missing_columns(bind)
+    migrate_analyses_autoincrement(bind)
+    init_search_index(bind)
+
+
+def add_missing_columns(bind) -> None:
+    """
+    Add nullable columns that were added to a model after its table was created.
+    
+    create_all only creates missing tables; this covers the simple case of
+    new optional columns on existing tables.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+
+def migrate_analyses_autoincrement(bind) -> None:
+    """
+    Make SQLite never reuse analysis IDs.
+    
+    Without AUTOINCREMENT, SQLite gives a new row the highest existing ID
+    plus one, so archiving the newest analysis would free its ID for the
+    next one. Tables created before AUTOINCREMENT was declared are rebuilt,
+    and the ID sequence is moved past every archived analysis.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+    
+    from app.models.analysis import Analysis
+    table = Analysis.__table__
+    
+    with bind.begin() as conn:
+        ddl = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table.name}
+        ).scalar()
+        if "AUTOINCREMENT" not in ddl.upper():
+            rebuilt = table.to_metadata(MetaData(), name=f"{table.name}_rebuild")
+            columns = ", ".join(column.name for column in table.columns)
+            # Left over if a previous rebuild was interrupted
+            conn.execute(text(f"DROP TABLE IF EXISTS {rebuilt.name}"))
+            conn.execute(CreateTable(rebuilt))
+            conn.execute(text(f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table.name}"))
+            conn.execute(text(f"DROP TABLE {table.name}"))
+            conn.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table.name}"))
+            for index in table.indexes:
+                index.create(conn)
+        
+        highest_archived = conn.execute(text("SELECT MAX(id) FROM archived_analyses")).scalar()
+        if highest_archived is not None:
+            sequence = conn.execute(
+                text("SELECT seq FROM sqlite_sequence WHERE name = :name"), {"name": table.name}
+            ).scalar()
+            if sequence is None:
+                conn.execute(
+                    text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                    {"name": table.name, "seq": highest_archived}
+                )
+            elif sequence < highest_archived:
+                conn.execute(
+                    text("UPDATE sqlite_sequence SET seq = :seq WHERE name = :name"),
+                    {"name": table.name, "seq": highest_archived}
+                )
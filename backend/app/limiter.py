@@ -0,0 +1,13 @@
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from app.config import settings
+
+
+# Shared rate limiter, keyed by client address.
+# headers_enabled adds X-RateLimit-* headers, and Retry-After on 429 responses.
+limiter = Limiter(key_func=get_remote_address, headers_enabled=True)
+
+
+def analysis_rate_limit() -> str:
+    """Per-client limit for starting analyses, from RATE_LIMIT_PER_MINUTE."""
+    return f"{settings.RATE_LIMIT_PER_MINUTE}/minute"
@@ -1,19 +1,21 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import init_db
+from app.limiter import limiter
+from app.services.admission import analysis_executor
 from app.api.analysis import router as analysis_router
+from app.api.admin import router as admin_router
+from app.api.export import router as export_router
+from app.api.search import router as search_router
+from app.api.stats import router as stats_router
 
 # Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+init_db()
 
 # Create FastAPI application
 app = FastAPI(
@@ -49,6 +51,16 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 app.include_router(analysis_router)
+app.include_router(admin_router)
+app.include_router(export_router)
+app.include_router(search_router)
+app.include_router(stats_router)
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Cancel queued analyses on shutdown."""
+    analysis_executor.shutdown()
 
 
 @app.get("/")
@@ -1,5 +1,7 @@
 # Models package
 from app.models.analysis import Analysis
 from app.models.comment import Comment
+from app.models.rollup import SentimentRollup
+from app.models.archive import ArchivedAnalysis
 
-__all__ = ["Analysis", "Comment"]
+__all__ = ["Analysis", "Comment", "SentimentRollup", "ArchivedAnalysis"]
@@ -23,5 +23,8 @@ class Analysis(Base):
     # Relationships
     comments = relationship("Comment", back_populates="analysis", cascade="all, delete-orphan")
     
+    # Never hand out the ID of a deleted (archived) analysis again
+    __table_args__ = {"sqlite_autoincrement": True}
+    
     def __repr__(self):
         return f"<Analysis(id={self.id}, post_url={self.post_url[:50]})>"
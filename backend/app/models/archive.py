@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ArchivedAnalysis(Base):
+    """
+    Index of analyses moved out of the live tables into archive files.
+    
+    id is the original analysis ID. The analysis and its comments are
+    stored in the `part` file of the `month` partition of the archive.
+    """
+    
+    __tablename__ = "archived_analyses"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    post_url = Column(String(500), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    total_comments = Column(Integer, default=0)
+    month = Column(String(7), nullable=False, index=True)
+    part = Column(String(100), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ArchivedAnalysis(id={self.id}, month={self.month}, part={self.part})>"
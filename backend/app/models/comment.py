@@ -13,6 +13,8 @@ class Comment(Base):
     comment_text = Column(Text, nullable=False)
     sentiment = Column(String(50), nullable=False)
     score = Column(Float, nullable=False)
+    model_name = Column(String(100), nullable=True)
+    model_version = Column(String(100), nullable=True)
     
     # Relationships
     analysis = relationship("Analysis", back_populates="comments")
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, UniqueConstraint
+from app.database import Base
+
+
+class SentimentRollup(Base):
+    """
+    Pre-aggregated sentiment counts per time bucket.
+    
+    One row per (granularity, scope, key, bucket_start, user_id), where scope
+    is "page" or "post" and key is the page name/ID or the post URL.
+    user_id is 0 for analyses without a user.
+    """
+    
+    __tablename__ = "sentiment_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    granularity = Column(String(10), nullable=False)
+    scope = Column(String(10), nullable=False)
+    key = Column(String(500), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    user_id = Column(Integer, nullable=False, default=0)
+    analysis_count = Column(Integer, nullable=False, default=0)
+    comment_count = Column(Integer, nullable=False, default=0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "scope", "key", "bucket_start", "user_id",
+            name="uq_sentiment_rollups_bucket"
+        ),
+        Index("ix_sentiment_rollups_top", "granularity", "scope", "bucket_start"),
+    )
+    
+    def __repr__(self):
+        return f"<SentimentRollup({self.granularity} {self.scope}={self.key[:50]} @ {self.bucket_start})>"
@@ -5,10 +5,30 @@ from app.schemas.analysis import (
     AnalysisListResponse,
     CommentResponse
 )
+from app.schemas.admin import (
+    ProfileSummary,
+    ConfiguredModel,
+    ResidentModel,
+    ModelRegistryStats,
+    PreprocessingStats
+)
+from app.schemas.search import CommentSearchResult, CommentSearchResponse
+from app.schemas.stats import SentimentTotals, TrendPoint, TrendResponse, TopEntry
 
 __all__ = [
     "AnalysisCreate",
     "AnalysisResponse",
     "AnalysisListResponse",
-    "CommentResponse"
+    "CommentResponse",
+    "ProfileSummary",
+    "ConfiguredModel",
+    "ResidentModel",
+    "ModelRegistryStats",
+    "PreprocessingStats",
+    "CommentSearchResult",
+    "CommentSearchResponse",
+    "SentimentTotals",
+    "TrendPoint",
+    "TrendResponse",
+    "TopEntry"
 ]
@@ -0,0 +1,59 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class ProfileSummary(BaseModel):
+    """Schema for a stored request profile."""
+    analysis_id: int
+    size_bytes: int
+    created_at: datetime
+
+
+class ConfiguredModel(BaseModel):
+    """Schema for a sentiment model configured in the registry."""
+    name: str
+    model_id: str
+    tokenizer_id: str
+    
+    class Config:
+        protected_namespaces = ()
+
+
+class ResidentModel(BaseModel):
+    """Schema for a sentiment model currently loaded in memory."""
+    name: str
+    model_id: str
+    version: str
+    memory_bytes: int
+    loaded_at: datetime
+    last_used_at: datetime
+    uses: int
+    
+    class Config:
+        protected_namespaces = ()
+
+
+class ModelRegistryStats(BaseModel):
+    """Schema for the model registry status."""
+    configured: List[ConfiguredModel]
+    resident: List[ResidentModel]
+    resident_bytes: int
+    memory_budget_bytes: int
+    shared_tokenizers: int
+    loads: int
+    evictions: int
+
+
+class PreprocessingStats(BaseModel):
+    """Schema for tokenization and padding metrics."""
+    texts: int
+    chunks: int
+    chunked_texts: int
+    truncated_texts: int
+    tokenize_seconds: float
+    tokenize_ms_per_text: Optional[float] = None
+    batches: int
+    tokens: int
+    padded_tokens: int
+    padding_waste: Optional[float] = None
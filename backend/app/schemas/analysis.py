@@ -6,6 +6,7 @@ from typing import List, Optional
 class AnalysisCreate(BaseModel):
     """Schema for creating a new analysis."""
     facebook_post_url: str
+    model: Optional[str] = None
 
 
 class CommentResponse(BaseModel):
@@ -14,9 +15,12 @@ class CommentResponse(BaseModel):
     comment_text: str
     sentiment: str
     score: float
+    model_name: Optional[str] = None
+    model_version: Optional[str] = None
     
     class Config:
         from_attributes = True
+        protected_namespaces = ()
 
 
 class AnalysisResponse(BaseModel):
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class CommentSearchResult(BaseModel):
+    """Schema for a comment matching a search."""
+    id: int
+    analysis_id: int
+    comment_text: str
+    sentiment: str
+    score: float
+    analysis_created_at: datetime
+    rank: float
+
+
+class CommentSearchResponse(BaseModel):
+    """Schema for a page of comment search results."""
+    results: List[CommentSearchResult]
+    next_cursor: Optional[str] = None
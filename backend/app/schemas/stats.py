@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class SentimentTotals(BaseModel):
+    """Schema for aggregated sentiment counts."""
+    analysis_count: int
+    comment_count: int
+    positive_count: int
+    neutral_count: int
+    negative_count: int
+    score_sum: float
+    average_score: Optional[float]
+
+
+class TrendPoint(SentimentTotals):
+    """Schema for one time bucket of a sentiment trend."""
+    bucket_start: datetime
+
+
+class TrendResponse(BaseModel):
+    """Schema for a sentiment trend of one page or post."""
+    scope: str
+    key: str
+    granularity: str
+    points: List[TrendPoint]
+
+
+class TopEntry(SentimentTotals):
+    """Schema for one page or post in a top-N ranking."""
+    key: str
@@ -1,4 +1,8 @@
 # Services package
 from app.services.analysis import AnalysisService
+from app.services.export import ExportService
+from app.services.search import SearchService
+from app.services.rollup import RollupService
+from app.services.retention import RetentionService
 
-__all__ = ["AnalysisService"]
+__all__ = ["AnalysisService", "ExportService", "SearchService", "RollupService", "RetentionService"]
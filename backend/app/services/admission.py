@@ -0,0 +1,81 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when the analysis executor is saturated."""
+    
+    def __init__(self, retry_after: int):
+        super().__init__("Server is busy, please retry later")
+        self.retry_after = retry_after
+
+
+class AnalysisExecutor:
+    """
+    Bounded executor for blocking analysis work.
+    
+    Runs synchronous work (Graph API calls, model inference, database
+    writes) on a dedicated thread pool so the event loop stays free for
+    other requests such as /health. At most max_workers jobs run at once
+    and at most max_queue more may wait; anything beyond that is rejected
+    immediately with AdmissionRejected instead of piling up.
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="analysis"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+    
+    @property
+    def pending(self) -> int:
+        """Number of jobs running or waiting."""
+        return self._pending
+    
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+    
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the executor and await its result.
+        
+        Raises:
+            AdmissionRejected: If max_workers + max_queue jobs are already pending
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise AdmissionRejected(self.retry_after)
+            self._pending += 1
+        
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        
+        # Release the slot when the work finishes, not when the caller stops
+        # waiting, so abandoned requests still count against the limit.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+    
+    def shutdown(self) -> None:
+        """Stop accepting work and cancel jobs that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+analysis_executor = AnalysisExecutor(
+    max_workers=settings.ANALYSIS_MAX_CONCURRENCY,
+    max_queue=settings.ANALYSIS_MAX_QUEUE,
+    retry_after=settings.ANALYSIS_RETRY_AFTER_SECONDS
+)
@@ -1,21 +1,65 @@
 import re
 from typing import List, Dict, Tuple, Optional
 from urllib.parse import urlparse, parse_qs
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import httpx
+import orjson
 
 from app.models.analysis import Analysis
 from app.models.comment import Comment
 from app.ai.sentiment import SentimentAnalyzer
+from app.services.retention import RetentionService
+from app.services.rollup import RollupService
 from app.config import settings
 
 
+URL_PATTERN = re.compile(r'http[s]?://\S+')
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize comment text."""
+    # Remove URLs
+    text = URL_PATTERN.sub('', text)
+    # Remove excessive whitespace
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def overall_sentiment(avg_score: float) -> str:
+    """Map an average star score to an overall sentiment."""
+    if avg_score >= 3.5:
+        return 'positive'
+    elif avg_score >= 2.5:
+        return 'neutral'
+    return 'negative'
+
+
 class AnalysisService:
     """Service for sentiment analysis operations."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        sentiment_analyzer: Optional[SentimentAnalyzer] = None,
+        transport: Optional[httpx.BaseTransport] = None
+    ):
+        """
+        Args:
+            db: Database session
+            sentiment_analyzer: Analyzer to use (defaults to one routing comments by language)
+            transport: Optional httpx transport for Facebook requests (e.g. a local stub)
+        """
         self.db = db
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self._sentiment_analyzer = sentiment_analyzer
+        self.transport = transport
+    
+    @property
+    def sentiment_analyzer(self) -> SentimentAnalyzer:
+        """The sentiment analyzer, created on first use so read-only requests never load the model."""
+        if self._sentiment_analyzer is None:
+            self._sentiment_analyzer = SentimentAnalyzer()
+        return self._sentiment_analyzer
     
     def extract_post_id(self, url: str) -> str:
         """Extract Facebook post ID from URL."""
@@ -103,7 +147,7 @@ class AnalysisService:
         )
         
         try:
-            with httpx.Client(follow_redirects=True, timeout=10.0) as client:
+            with httpx.Client(follow_redirects=True, timeout=10.0, transport=self.transport) as client:
                 response = client.get(safe_url, headers=headers)
                 
                 # If Facebook returns an error, return None to trigger fallback
@@ -153,7 +197,7 @@ class AnalysisService:
         }
         
         try:
-            with httpx.Client(timeout=10.0) as client:
+            with httpx.Client(timeout=10.0, transport=self.transport) as client:
                 response = client.get(api_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -320,7 +364,7 @@ class AnalysisService:
         max_pages = 10  # Limit to prevent excessive API calls
         page_count = 0
         
-        with httpx.Client(timeout=30.0) as client:
+        with httpx.Client(timeout=30.0, transport=self.transport) as client:
             while page_count < max_pages:
                 page_count += 1
                 response = client.get(api_url, params=params)
@@ -360,29 +404,57 @@ class AnalysisService:
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize comment text."""
-        # Remove URLs
-        text = re.sub(r'http[s]?://\S+', '', text)
-        # Remove excessive whitespace
-        text = ' '.join(text.split())
-        return text.strip()
+        return clean_text(text)
     
-    def analyze_post(self, post_url: str) -> Analysis:
+    def clean_comments(self, raw_comments: List[str]) -> List[str]:
+        """Clean comments, dropping the ones that are empty after cleaning."""
+        cleaned_comments = []
+        for comment in raw_comments:
+            cleaned = self.clean_text(comment)
+            if cleaned:
+                cleaned_comments.append(cleaned)
+        return cleaned_comments
+    
+    def analyze_post(self, post_url: str, model_name: Optional[str] = None) -> Analysis:
         """
         Analyze sentiment of all comments in a Facebook post.
         Returns the Analysis object with all results.
+        
+        Args:
+            post_url: The URL of the Facebook post
+            model_name: Registry model to use (by default the model is
+                chosen per comment language, falling back to the default model)
         """
-        # Extract post ID for reference
-        post_id = self.extract_post_id(post_url)
+        analyzer = SentimentAnalyzer(model_name) if model_name else self.sentiment_analyzer
         
         # Fetch comments
         raw_comments = self.fetch_comments(post_url)
         
         # Clean comments
-        cleaned_comments = [self.clean_text(c) for c in raw_comments if self.clean_text(c)]
+        cleaned_comments = self.clean_comments(raw_comments)
         
         # Run sentiment analysis on all comments
-        sentiment_results = self.sentiment_analyzer.analyze_batch(cleaned_comments)
+        sentiment_results = analyzer.analyze_batch(cleaned_comments)
+        
+        return self.save_analysis(post_url, cleaned_comments, sentiment_results)
+    
+    def save_analysis(
+        self,
+        post_url: str,
+        cleaned_comments: List[str],
+        sentiment_results: List[Dict]
+    ) -> Analysis:
+        """
+        Compute overall statistics and store the analysis with its comments.
+        
+        Args:
+            post_url: The URL of the analyzed post
+            cleaned_comments: Cleaned comment texts
+            sentiment_results: Sentiment results, in the same order as cleaned_comments
         
+        Returns:
+            The stored Analysis object
+        """
         # Calculate statistics
         positive_count = sum(1 for r in sentiment_results if r['sentiment'] == 'positive')
         neutral_count = sum(1 for r in sentiment_results if r['sentiment'] == 'neutral')
@@ -391,17 +463,11 @@ class AnalysisService:
         
         # Calculate overall sentiment
         avg_score = sum(r['score'] for r in sentiment_results) / total_comments if total_comments > 0 else 0
-        if avg_score >= 3.5:
-            overall_sentiment = 'positive'
-        elif avg_score >= 2.5:
-            overall_sentiment = 'neutral'
-        else:
-            overall_sentiment = 'negative'
         
         # Create analysis record
         analysis = Analysis(
             post_url=post_url,
-            overall_sentiment=overall_sentiment,
+            overall_sentiment=overall_sentiment(avg_score),
             overall_score=avg_score,
             positive_count=positive_count,
             neutral_count=neutral_count,
@@ -417,10 +483,16 @@ class AnalysisService:
                 analysis_id=analysis.id,
                 comment_text=comment_text,
                 sentiment=result['sentiment'],
-                score=result['score']
+                score=result['score'],
+                model_name=result.get('model'),
+                model_version=result.get('model_version')
             )
             self.db.add(comment)
         
+        # Update the precomputed statistics in the same transaction
+        self.db.flush()
+        RollupService(self.db).apply_analysis(analysis)
+        
         self.db.commit()
         self.db.refresh(analysis)
         
@@ -443,3 +515,52 @@ class AnalysisService:
             .filter(Analysis.id == analysis_id)
             .first()
         )
+    
+    def get_analysis_json(self, analysis_id: int) -> Optional[bytes]:
+        """
+        Get a specific analysis with its comments, serialized as JSON.
+        
+        Produces the same document as AnalysisResponse, but reads plain
+        columns and encodes them with orjson instead of building ORM
+        objects and validating every comment through pydantic. Analyses
+        moved out of the live tables are read from the archive.
+        
+        Returns:
+            The JSON body, or None if the analysis does not exist
+        """
+        analysis = self.db.execute(
+            select(
+                Analysis.id,
+                Analysis.post_url,
+                Analysis.overall_sentiment,
+                Analysis.overall_score,
+                Analysis.positive_count,
+                Analysis.neutral_count,
+                Analysis.negative_count,
+                Analysis.total_comments,
+                Analysis.created_at,
+            ).where(Analysis.id == analysis_id)
+        ).mappings().first()
+        
+        if analysis is None:
+            document = RetentionService(self.db).get_archived_analysis(analysis_id)
+            if document is None:
+                return None
+            return orjson.dumps(document, option=orjson.OPT_UTC_Z)
+        
+        comments = self.db.execute(
+            select(
+                Comment.id,
+                Comment.comment_text,
+                Comment.sentiment,
+                Comment.score,
+                Comment.model_name,
+                Comment.model_version,
+            )
+            .where(Comment.analysis_id == analysis_id)
+            .order_by(Comment.id)
+        ).mappings().all()
+        
+        document = dict(analysis)
+        document["comments"] = [dict(comment) for comment in comments]
+        return orjson.dumps(document, option=orjson.OPT_UTC_Z)
@@ -0,0 +1,332 @@
+import csv
+import io
+import json
+import os
+from collections import deque
+from multiprocessing import get_context
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.analysis import Analysis
+from app.models.comment import Comment
+from app.services.analysis import clean_text, overall_sentiment
+from app.services.rollup import RollupService
+
+
+OUTPUT_FIELDS = ["row", "id", "text", "sentiment", "score", "confidence", "model", "model_version"]
+
+# Analyzer of the current worker process, created by _init_worker
+_worker_analyzer = None
+
+
+def _file_format(path: str, explicit: Optional[str] = None) -> str:
+    """Guess csv/jsonl from a file extension."""
+    if explicit:
+        return explicit
+    name = path.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {path}; pass it explicitly (csv or jsonl)")
+
+
+def read_records(path: str, format: str) -> Iterator[Dict]:
+    """Stream records from a CSV or JSONL file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _init_worker(threads: Optional[int], model_name: Optional[str]) -> None:
+    """Create the analyzer once per worker process."""
+    global _worker_analyzer
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    
+    from app.ai.sentiment import SentimentAnalyzer
+    _worker_analyzer = SentimentAnalyzer(model_name)
+
+
+def _score_chunk(texts: List[str], batch_size: int) -> List[Dict]:
+    """Score a chunk of cleaned texts in a worker process."""
+    return _worker_analyzer.analyze_batch(texts, batch_size=batch_size)
+
+
+class BatchScoringJob:
+    """
+    Offline scoring of a comment file with the sentiment model.
+    
+    Input rows are cleaned with the same clean_text as analyze_post,
+    rows that are empty after cleaning are skipped, and the rest are
+    scored in chunks across worker processes. Results are appended to
+    the output file in input order; after every chunk the output is
+    fsynced and a checkpoint records how far the input has been consumed,
+    so a killed job can resume where it stopped.
+    """
+    
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        text_column: str = "text",
+        id_column: Optional[str] = None,
+        input_format: Optional[str] = None,
+        workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        chunk_size: int = 1024,
+        batch_size: int = 32,
+        model_name: Optional[str] = None,
+        analyzer=None
+    ):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.text_column = text_column
+        self.id_column = id_column
+        self.input_format = _file_format(input_path, input_format)
+        self.output_format = _file_format(output_path)
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.model_name = model_name
+        self.analyzer = analyzer
+        self.checkpoint_path = output_path + ".checkpoint.json"
+    
+    def load_checkpoint(self) -> Optional[Dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+    
+    def _save_checkpoint(self, state: Dict) -> None:
+        """Write the checkpoint atomically."""
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def _chunks(self, skip_rows: int) -> Iterator[Tuple[int, List[Tuple[int, Optional[str], str]]]]:
+        """
+        Yield (rows consumed so far, chunk) pairs.
+        
+        A chunk holds (row number, id, cleaned text) for up to chunk_size
+        non-empty rows; empty rows are consumed but not scored.
+        """
+        chunk = []
+        row_number = 0
+        for record in read_records(self.input_path, self.input_format):
+            row_number += 1
+            if row_number <= skip_rows:
+                continue
+            
+            if self.text_column not in record:
+                raise ValueError(f"Row {row_number} has no '{self.text_column}' column")
+            
+            text = clean_text(str(record[self.text_column] or ""))
+            if not text:
+                continue
+            
+            record_id = str(record[self.id_column]) if self.id_column else None
+            chunk.append((row_number, record_id, text))
+            if len(chunk) >= self.chunk_size:
+                yield row_number, chunk
+                chunk = []
+        
+        yield row_number, chunk
+    
+    def _encode_rows(self, rows: List[Tuple], results: List[Dict]) -> bytes:
+        """Encode scored rows in the output format."""
+        buffer = io.StringIO()
+        
+        if self.output_format == "csv":
+            writer = csv.writer(buffer)
+            for (row_number, record_id, text), result in zip(rows, results):
+                writer.writerow([
+                    row_number, record_id or "", text,
+                    result["sentiment"], result["score"], result["confidence"],
+                    result.get("model") or "", result.get("model_version") or ""
+                ])
+            return buffer.getvalue().encode("utf-8")
+        
+        for (row_number, record_id, text), result in zip(rows, results):
+            buffer.write(json.dumps({
+                "row": row_number,
+                "id": record_id,
+                "text": text,
+                "sentiment": result["sentiment"],
+                "score": result["score"],
+                "confidence": result["confidence"],
+                "model": result.get("model"),
+                "model_version": result.get("model_version"),
+            }, ensure_ascii=False) + "\n")
+        return buffer.getvalue().encode("utf-8")
+    
+    def run(self, resume: bool = False, progress=None) -> Dict:
+        """
+        Score the whole input file.
+        
+        Args:
+            resume: Continue from an existing checkpoint
+            progress: Optional callable called with the checkpoint state after each chunk
+        
+        Returns:
+            The final checkpoint state
+        
+        Raises:
+            ValueError: If a checkpoint exists and resume is False, the
+                checkpoint belongs to a different input, or the output file
+                is missing or shorter than the checkpoint says
+        """
+        state = self.load_checkpoint()
+        if state is not None and not resume:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} exists; resume the job or delete it first"
+            )
+        if state is not None and state["input"] != os.path.abspath(self.input_path):
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to {state['input']}")
+        
+        if state is None:
+            state = {
+                "input": os.path.abspath(self.input_path),
+                "rows_read": 0,
+                "rows_scored": 0,
+                "output_bytes": 0,
+                "done": False,
+            }
+        if state["done"]:
+            return state
+        
+        output_bytes = os.path.getsize(self.output_path) if os.path.exists(self.output_path) else 0
+        if output_bytes < state["output_bytes"]:
+            raise ValueError(
+                f"{self.output_path} has {output_bytes} bytes but the checkpoint expects "
+                f"{state['output_bytes']}; delete the checkpoint to start over"
+            )
+        
+        # Drop anything written after the last checkpoint
+        mode = "r+b" if os.path.exists(self.output_path) else "wb"
+        f = open(self.output_path, mode)
+        try:
+            f.truncate(state["output_bytes"])
+            f.seek(state["output_bytes"])
+            if state["output_bytes"] == 0 and self.output_format == "csv":
+                f.write((",".join(OUTPUT_FIELDS) + "\r\n").encode("utf-8"))
+            
+            for rows_read, rows, results in self._score(state["rows_read"]):
+                f.write(self._encode_rows(rows, results))
+                f.flush()
+                os.fsync(f.fileno())
+                
+                state["rows_read"] = rows_read
+                state["rows_scored"] += len(rows)
+                state["output_bytes"] = f.tell()
+                self._save_checkpoint(state)
+                if progress is not None:
+                    progress(state)
+        finally:
+            f.close()
+        
+        state["done"] = True
+        self._save_checkpoint(state)
+        return state
+    
+    def mark_loaded(self, analysis_id: int) -> None:
+        """Record in the checkpoint that the output was stored as an analysis."""
+        state = self.load_checkpoint()
+        state["loaded_analysis_id"] = analysis_id
+        self._save_checkpoint(state)
+    
+    def _score(self, skip_rows: int) -> Iterator[Tuple[int, List[Tuple], List[Dict]]]:
+        """Yield (rows consumed, rows, results) per chunk, in input order."""
+        chunks = self._chunks(skip_rows)
+        
+        if self.workers == 1:
+            analyzer = self.analyzer
+            if analyzer is None:
+                from app.ai.sentiment import SentimentAnalyzer
+                analyzer = SentimentAnalyzer(self.model_name)
+            for rows_read, rows in chunks:
+                texts = [text for _, _, text in rows]
+                yield rows_read, rows, analyzer.analyze_batch(texts, batch_size=self.batch_size)
+            return
+        
+        # Keep a bounded number of chunks in flight so the input is never
+        # read ahead of the workers by more than a few chunks.
+        context = get_context("spawn")
+        with context.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.model_name)
+        ) as pool:
+            in_flight = deque()
+            for rows_read, rows in chunks:
+                texts = [text for _, _, text in rows]
+                in_flight.append((rows_read, rows, pool.apply_async(_score_chunk, (texts, self.batch_size))))
+                if len(in_flight) >= self.workers * 2:
+                    done_rows_read, done_rows, result = in_flight.popleft()
+                    yield done_rows_read, done_rows, result.get()
+            
+            while in_flight:
+                done_rows_read, done_rows, result = in_flight.popleft()
+                yield done_rows_read, done_rows, result.get()
+
+
+def load_scored_file(db: Session, path: str, post_url: str, batch_size: int = 5000) -> Analysis:
+    """
+    Store a scored output file as one Analysis with its comments.
+    
+    Comments are bulk-inserted in batches while the file is streamed, and
+    the overall statistics and rollups are updated at the end, all in one
+    transaction.
+    """
+    analysis = Analysis(post_url=post_url, total_comments=0)
+    db.add(analysis)
+    db.flush()
+    
+    counts = {"positive": 0, "neutral": 0, "negative": 0}
+    score_sum = 0.0
+    total = 0
+    
+    batch = []
+    for record in read_records(path, _file_format(path)):
+        score = float(record["score"])
+        counts[record["sentiment"]] += 1
+        score_sum += score
+        total += 1
+        batch.append({
+            "analysis_id": analysis.id,
+            "comment_text": record["text"],
+            "sentiment": record["sentiment"],
+            "score": score,
+            "model_name": record.get("model") or None,
+            "model_version": record.get("model_version") or None,
+        })
+        if len(batch) >= batch_size:
+            db.execute(insert(Comment), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Comment), batch)
+    
+    avg_score = score_sum / total if total else 0
+    analysis.overall_sentiment = overall_sentiment(avg_score)
+    analysis.overall_score = avg_score
+    analysis.positive_count = counts["positive"]
+    analysis.neutral_count = counts["neutral"]
+    analysis.negative_count = counts["negative"]
+    analysis.total_comments = total
+    db.flush()
+    
+    RollupService(db).apply_analysis(analysis)
+    db.commit()
+    db.refresh(analysis)
+    return analysis
@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.analysis import Analysis
+from app.models.comment import Comment
+
+
+EXPORT_COLUMNS = [
+    "analysis_id",
+    "post_url",
+    "analysis_created_at",
+    "comment_id",
+    "comment_text",
+    "sentiment",
+    "score",
+    "model_name",
+    "model_version",
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORT_COMPRESSIONS = {
+    "none": None,
+    "gzip": ("application/gzip", "gz"),
+    "zstd": ("application/zstd", "zst"),
+}
+
+
+class ExportService:
+    """
+    Service for streaming comment-level exports.
+    
+    Rows are read with a server-side cursor (`yield_per`) and encoded batch
+    by batch, so memory stays constant regardless of the number of rows.
+    """
+    
+    def __init__(self, db: Session, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+    
+    def analysis_exists(self, analysis_id: int) -> bool:
+        """Check whether an analysis exists."""
+        return self.db.execute(
+            select(Analysis.id).where(Analysis.id == analysis_id)
+        ).first() is not None
+    
+    def iter_batches(
+        self,
+        analysis_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        Yield batches of export rows, in EXPORT_COLUMNS order.
+        
+        Args:
+            analysis_id: Only export this analysis
+            start: Only export analyses created at or after this time
+            end: Only export analyses created before this time
+        """
+        stmt = (
+            select(
+                Analysis.id,
+                Analysis.post_url,
+                Analysis.created_at,
+                Comment.id,
+                Comment.comment_text,
+                Comment.sentiment,
+                Comment.score,
+                Comment.model_name,
+                Comment.model_version,
+            )
+            .join(Comment, Comment.analysis_id == Analysis.id)
+            .order_by(Analysis.id, Comment.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        if analysis_id is not None:
+            stmt = stmt.where(Analysis.id == analysis_id)
+        if start is not None:
+            stmt = stmt.where(Analysis.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(Analysis.created_at < end)
+        
+        result = self.db.execute(stmt)
+        try:
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            result.close()
+
+
+def encode_csv(batches: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """Encode row batches as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    
+    for batch in batches:
+        writer.writerows(
+            (row[0], row[1], row[2].isoformat() if row[2] else "", *row[3:])
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header only, for empty exports
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(batches: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """Encode row batches as newline-delimited JSON objects."""
+    for batch in batches:
+        lines = []
+        for row in batch:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            if record["analysis_created_at"] is not None:
+                record["analysis_created_at"] = record["analysis_created_at"].isoformat()
+            lines.append(json.dumps(record, ensure_ascii=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def encode_parquet(batches: Iterable[List[Tuple]], compression: str = "none") -> Iterator[bytes]:
+    """
+    Encode row batches as a Parquet file, one row group per batch.
+    
+    Args:
+        batches: Row batches in EXPORT_COLUMNS order
+        compression: Parquet column codec ("none", "gzip" or "zstd")
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ("analysis_id", pa.int64()),
+        ("post_url", pa.string()),
+        ("analysis_created_at", pa.timestamp("us")),
+        ("comment_id", pa.int64()),
+        ("comment_text", pa.string()),
+        ("sentiment", pa.string()),
+        ("score", pa.float64()),
+        ("model_name", pa.string()),
+        ("model_version", pa.string()),
+    ])
+    
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    try:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def compress_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a stream of chunks on the fly."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_zstd(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Zstandard-compress a stream of chunks on the fly."""
+    import zstandard
+    
+    compressor = zstandard.ZstdCompressor().compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(
+    format: str,
+    compression: str = "none",
+    analysis_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """
+    Stream an export as bytes, using its own database session.
+    
+    The session lives as long as the generator, since a streaming
+    response outlives the request-scoped session.
+    """
+    db = SessionLocal()
+    try:
+        batches = ExportService(db).iter_batches(analysis_id=analysis_id, start=start, end=end)
+        
+        if format == "parquet":
+            # Parquet compresses column chunks itself
+            yield from encode_parquet(batches, compression=compression)
+            return
+        
+        chunks = encode_csv(batches) if format == "csv" else encode_ndjson(batches)
+        if compression == "gzip":
+            chunks = compress_gzip(chunks)
+        elif compression == "zstd":
+            chunks = compress_zstd(chunks)
+        yield from chunks
+    finally:
+        db.close()
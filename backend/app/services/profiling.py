@@ -0,0 +1,151 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Only one profiler can be active per process (Python 3.12+ refuses a
+# second one, and there a profiler also records every thread)
+_profiler_lock = threading.Lock()
+
+
+def should_profile(headers: Mapping[str, str]) -> bool:
+    """
+    Decide whether a request should run under the profiler.
+    
+    Profiling is opt-in: it must be enabled in the settings, the request
+    must carry the profiling header, and the request must be picked by
+    the configured sample rate.
+    """
+    if not settings.PROFILING_ENABLED:
+        return False
+    
+    value = headers.get(settings.PROFILING_HEADER)
+    if value is None or value.strip().lower() in ("", "0", "false", "no"):
+        return False
+    
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def profile_call(enabled: bool, func: Callable, *args, **kwargs) -> Tuple[Any, Optional[cProfile.Profile]]:
+    """
+    Call a function, optionally under cProfile.
+    
+    Profiling is best effort: if another call is being profiled, or the
+    profiler cannot be started, the function runs unprofiled.
+    
+    Returns:
+        A tuple of (result, profiler). The profiler is None when
+        the call was not profiled.
+    """
+    if not enabled:
+        return func(*args, **kwargs), None
+    
+    if not _profiler_lock.acquire(blocking=False):
+        logger.info("Another call is being profiled; running this one unprofiled")
+        return func(*args, **kwargs), None
+    
+    try:
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        except Exception:
+            logger.warning("Could not start the profiler; running unprofiled", exc_info=True)
+            return func(*args, **kwargs), None
+        
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        return result, profiler
+    finally:
+        _profiler_lock.release()
+
+
+class ProfileStore:
+    """Stores pstats dumps on disk, keyed by analysis ID."""
+    
+    def __init__(self, directory: Optional[str] = None, max_profiles: Optional[int] = None):
+        self.directory = directory or settings.PROFILING_DIR
+        self.max_profiles = max_profiles or settings.PROFILING_MAX_PROFILES
+    
+    def _path(self, analysis_id: int) -> str:
+        return os.path.join(self.directory, f"analysis-{analysis_id}.pstats")
+    
+    def save(self, analysis_id: int, profiler: cProfile.Profile) -> str:
+        """Dump a profile for an analysis and prune the oldest ones."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(analysis_id)
+        profiler.dump_stats(path)
+        self._prune()
+        return path
+    
+    def _prune(self) -> None:
+        """Keep at most max_profiles files, removing the oldest first."""
+        entries = self.list_profiles()
+        for entry in entries[self.max_profiles:]:
+            try:
+                os.remove(self._path(entry["analysis_id"]))
+            except OSError:
+                pass
+    
+    def list_profiles(self) -> List[Dict]:
+        """List stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        
+        entries = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith("analysis-") and name.endswith(".pstats")):
+                continue
+            try:
+                analysis_id = int(name[len("analysis-"):-len(".pstats")])
+                stat = os.stat(os.path.join(self.directory, name))
+            except (ValueError, OSError):
+                continue
+            entries.append({
+                "analysis_id": analysis_id,
+                "size_bytes": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            })
+        
+        entries.sort(key=lambda e: e["created_at"], reverse=True)
+        return entries
+    
+    def get_path(self, analysis_id: int) -> Optional[str]:
+        """Get the path of a stored profile, or None if it does not exist."""
+        path = self._path(analysis_id)
+        return path if os.path.isfile(path) else None
+    
+    def render_text(self, analysis_id: int, sort: str = "cumulative", limit: int = 50) -> Optional[str]:
+        """
+        Render a stored profile as a pstats text report.
+        
+        Args:
+            analysis_id: The analysis the profile belongs to
+            sort: pstats sort key (e.g. "cumulative", "tottime", "calls")
+            limit: Maximum number of functions to include
+        
+        Returns:
+            The report, or None if no profile is stored for the analysis
+        """
+        path = self.get_path(analysis_id)
+        if path is None:
+            return None
+        
+        stream = io.StringIO()
+        stats = pstats.Stats(path, stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from app.config import settings
+
+
+class CachedResponse(NamedTuple):
+    """A serialized response body and its strong ETag."""
+    body: bytes
+    etag: str
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized responses, bounded by total size.
+    
+    Only suitable for immutable resources: entries are never invalidated,
+    just evicted when the cache is over max_bytes.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def size(self) -> int:
+        """Total size of the cached bodies in bytes."""
+        return self._size
+    
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key: Hashable, body: bytes) -> CachedResponse:
+        """Cache a body and return it with its ETag."""
+        entry = CachedResponse(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        
+        # Bodies larger than the whole cache are served but not kept
+        if len(body) > self.max_bytes:
+            return entry
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += len(body)
+            
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+        
+        return entry
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+analysis_response_cache = ResponseCache(settings.ANALYSIS_CACHE_MAX_BYTES)
@@ -0,0 +1,358 @@
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import delete, inspect, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.analysis import Analysis
+from app.models.archive import ArchivedAnalysis
+from app.models.comment import Comment
+from app.services.rollup import to_naive_utc
+
+
+logger = logging.getLogger(__name__)
+
+# Column order matches the documents built by AnalysisService.get_analysis_json
+ANALYSIS_COLUMNS = [
+    Analysis.id,
+    Analysis.post_url,
+    Analysis.overall_sentiment,
+    Analysis.overall_score,
+    Analysis.positive_count,
+    Analysis.neutral_count,
+    Analysis.negative_count,
+    Analysis.total_comments,
+    Analysis.created_at,
+    Analysis.user_id,
+]
+
+COMMENT_COLUMNS = [
+    Comment.id,
+    Comment.comment_text,
+    Comment.sentiment,
+    Comment.score,
+    Comment.model_name,
+    Comment.model_version,
+    Comment.analysis_id,
+]
+
+# Comments per Parquet row group
+COMMENT_ROW_GROUP_SIZE = 50000
+
+
+def _schemas():
+    """Parquet schemas of the analyses and comments archive files."""
+    import pyarrow as pa
+    
+    analyses = pa.schema([
+        ("id", pa.int64()),
+        ("post_url", pa.string()),
+        ("overall_sentiment", pa.string()),
+        ("overall_score", pa.float64()),
+        ("positive_count", pa.int64()),
+        ("neutral_count", pa.int64()),
+        ("negative_count", pa.int64()),
+        ("total_comments", pa.int64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("user_id", pa.int64()),
+    ])
+    comments = pa.schema([
+        ("id", pa.int64()),
+        ("comment_text", pa.string()),
+        ("sentiment", pa.string()),
+        ("score", pa.float64()),
+        ("model_name", pa.string()),
+        ("model_version", pa.string()),
+        ("analysis_id", pa.int64()),
+    ])
+    return analyses, comments
+
+
+def _chunked(items: List[int], size: int) -> Iterator[List[int]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class _PartWriter:
+    """
+    Parquet writer that publishes its file only once it is complete.
+    
+    Rows go to a temporary file that is fsynced and renamed into place
+    on success, and removed on error.
+    """
+    
+    def __init__(self, path: str, schema):
+        import pyarrow.parquet as pq
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.schema = schema
+        self._file = open(self.tmp_path, "wb")
+        self._writer = pq.ParquetWriter(self._file, schema, compression="zstd")
+    
+    def write(self, rows: List) -> None:
+        """Write rows (in schema order) as one row group."""
+        import pyarrow as pa
+        
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._writer.close()
+        if exc_type is None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.tmp_path, self.path)
+        else:
+            self._file.close()
+            os.remove(self.tmp_path)
+        return False
+
+
+def _database_size(conn, dialect: str) -> Optional[int]:
+    """Size of the database in bytes, where the dialect can report it."""
+    if dialect == "sqlite":
+        page_count = conn.execute(text("PRAGMA page_count")).scalar()
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        return page_count * page_size
+    if dialect == "postgresql":
+        return conn.execute(text("SELECT pg_database_size(current_database())")).scalar()
+    return None
+
+
+class RetentionService:
+    """
+    Service for moving old analyses out of the live tables.
+    
+    Analyses older than the retention period are written, with their
+    comments, to zstd-compressed Parquet files partitioned by the month
+    the analysis was created in:
+        
+        {archive_dir}/analyses/month=YYYY-MM/{part}.parquet
+        {archive_dir}/comments/month=YYYY-MM/{part}.parquet
+    
+    and then deleted from the database. The archived_analyses table keeps
+    the part each analysis went to, so single analyses can still be read
+    back. Rollups are kept, so trends and top-N still include archived
+    analyses; archived comments are no longer searchable.
+    """
+    
+    def __init__(self, db: Session, archive_dir: Optional[str] = None, batch_size: int = 1000):
+        self.db = db
+        self.archive_dir = archive_dir or settings.ARCHIVE_DIR
+        self.batch_size = batch_size
+    
+    def _path(self, dataset: str, month: str, part: str) -> str:
+        return os.path.join(self.archive_dir, dataset, f"month={month}", part)
+    
+    def _eligible(self, cutoff: datetime) -> "OrderedDict[str, List[int]]":
+        """
+        IDs of analyses created before cutoff, grouped by month.
+        
+        Analyses whose ID is already archived are skipped. That can only
+        happen in SQLite databases archived before analysis IDs were made
+        AUTOINCREMENT; archiving them would make the earlier one unreachable.
+        """
+        rows = self.db.execute(
+            select(Analysis.id, Analysis.created_at)
+            .where(Analysis.created_at < cutoff)
+            .order_by(Analysis.created_at, Analysis.id)
+        )
+        archived = set(self.db.execute(select(ArchivedAnalysis.id)).scalars())
+        months: "OrderedDict[str, List[int]]" = OrderedDict()
+        for analysis_id, created_at in rows:
+            if analysis_id in archived:
+                logger.warning("Not archiving analysis %s: its ID is already archived", analysis_id)
+                continue
+            months.setdefault(to_naive_utc(created_at).strftime("%Y-%m"), []).append(analysis_id)
+        return months
+    
+    def archive(self, older_than_days: Optional[int] = None) -> Dict:
+        """
+        Archive analyses older than the retention period.
+        
+        Each month is written to a new part file first, and rows are only
+        deleted once the file is complete. If the job is interrupted, the
+        analyses not yet deleted are archived again by the next run.
+        
+        Args:
+            older_than_days: Retention period (defaults to RETENTION_DAYS)
+        
+        Returns:
+            Summary with the cutoff and the number of analyses, comments
+            and parts archived
+        
+        Raises:
+            ValueError: If the retention period is negative
+        """
+        days = settings.RETENTION_DAYS if older_than_days is None else older_than_days
+        if days < 0:
+            raise ValueError("Retention period must not be negative")
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        summary = {"cutoff": cutoff, "analyses": 0, "comments": 0, "parts": []}
+        
+        for month, ids in self._eligible(cutoff).items():
+            ids.sort()
+            part = f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+            summary["comments"] += self._write_part(month, part, ids)
+            self._delete_archived(month, part, ids)
+            summary["analyses"] += len(ids)
+            summary["parts"].append(f"month={month}/{part}")
+        
+        return summary
+    
+    def _write_part(self, month: str, part: str, ids: List[int]) -> int:
+        """Write the analyses and comments of one month; returns the comment count."""
+        analysis_schema, comment_schema = _schemas()
+        comment_count = 0
+        
+        with _PartWriter(self._path("analyses", month, part), analysis_schema) as analyses, \
+                _PartWriter(self._path("comments", month, part), comment_schema) as comments:
+            for chunk in _chunked(ids, self.batch_size):
+                analyses.write(self.db.execute(
+                    select(*ANALYSIS_COLUMNS).where(Analysis.id.in_(chunk)).order_by(Analysis.id)
+                ).all())
+                
+                result = self.db.execute(
+                    select(*COMMENT_COLUMNS)
+                    .where(Comment.analysis_id.in_(chunk))
+                    .order_by(Comment.analysis_id, Comment.id)
+                    .execution_options(yield_per=COMMENT_ROW_GROUP_SIZE)
+                )
+                for rows in result.partitions():
+                    comments.write(rows)
+                    comment_count += len(rows)
+        
+        return comment_count
+    
+    def _delete_archived(self, month: str, part: str, ids: List[int]) -> None:
+        """Index archived analyses and delete them from the live tables, one transaction per batch."""
+        for chunk in _chunked(ids, self.batch_size):
+            entries = self.db.execute(
+                select(Analysis.id, Analysis.post_url, Analysis.created_at, Analysis.total_comments)
+                .where(Analysis.id.in_(chunk))
+            ).mappings().all()
+            self.db.execute(
+                insert(ArchivedAnalysis),
+                [{**entry, "month": month, "part": part} for entry in entries]
+            )
+            self.db.execute(
+                delete(Comment).where(Comment.analysis_id.in_(chunk)),
+                execution_options={"synchronize_session": False}
+            )
+            self.db.execute(
+                delete(Analysis).where(Analysis.id.in_(chunk)),
+                execution_options={"synchronize_session": False}
+            )
+            self.db.commit()
+    
+    def reclaim(self, full: bool = False) -> Dict:
+        """
+        Give the space freed by archiving back to the filesystem.
+        
+        On SQLite the full-text index is merged and the database is
+        rebuilt with VACUUM, which needs free disk space about the size of
+        the database. On PostgreSQL, VACUUM ANALYZE makes the space
+        reusable; full=True runs VACUUM FULL, which shrinks the files but
+        locks the tables while it runs.
+        
+        Returns:
+            The dialect and the database size before and after, in bytes
+            (None where the dialect cannot report it)
+        """
+        self.db.commit()
+        bind = self.db.get_bind()
+        dialect = bind.dialect.name
+        
+        # VACUUM cannot run inside a transaction
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            size_before = _database_size(conn, dialect)
+            
+            if dialect == "sqlite":
+                if inspect(conn).has_table("comments_fts"):
+                    conn.execute(text("INSERT INTO comments_fts(comments_fts) VALUES ('optimize')"))
+                conn.execute(text("VACUUM"))
+            elif dialect == "postgresql":
+                command = "VACUUM (FULL, ANALYZE)" if full else "VACUUM (ANALYZE)"
+                for table in ("comments", "analyses"):
+                    conn.execute(text(f"{command} {table}"))
+            
+            size_after = _database_size(conn, dialect)
+        
+        return {"dialect": dialect, "size_before": size_before, "size_after": size_after}
+    
+    def iter_archived_analyses(self) -> Iterator[Dict]:
+        """Yield the analysis rows (without comments) of all archived analyses."""
+        import pyarrow.parquet as pq
+        
+        parts = self.db.execute(
+            select(ArchivedAnalysis.month, ArchivedAnalysis.part).distinct()
+        ).all()
+        for month, part in parts:
+            # A part may also hold analyses whose deletion never committed
+            ids = set(self.db.execute(
+                select(ArchivedAnalysis.id)
+                .where(ArchivedAnalysis.month == month, ArchivedAnalysis.part == part)
+            ).scalars())
+            for row in pq.read_table(self._path("analyses", month, part)).to_pylist():
+                if row["id"] in ids:
+                    yield row
+    
+    def get_archived_analysis(self, analysis_id: int) -> Optional[Dict]:
+        """
+        Read an archived analysis with its comments.
+        
+        Only the row groups that can hold the analysis are read, using the
+        Parquet column statistics.
+        
+        Returns:
+            The same document as AnalysisService.get_analysis_json, as a
+            dict, or None if the analysis was not archived
+        
+        Raises:
+            LookupError: If the index points to a part without the analysis
+        """
+        import pyarrow.parquet as pq
+        
+        entry = self.db.get(ArchivedAnalysis, analysis_id)
+        if entry is None:
+            return None
+        
+        analyses = pq.read_table(
+            self._path("analyses", entry.month, entry.part),
+            filters=[("id", "=", analysis_id)]
+        ).to_pylist()
+        if not analyses:
+            raise LookupError(f"Analysis {analysis_id} is missing from archive part {entry.month}/{entry.part}")
+        
+        comments = pq.read_table(
+            self._path("comments", entry.month, entry.part),
+            filters=[("analysis_id", "=", analysis_id)]
+        ).to_pylist()
+        
+        document = analyses[0]
+        del document["user_id"]
+        # Match what the live tables return: only PostgreSQL keeps the time zone
+        if document["created_at"] is not None and self.db.get_bind().dialect.name != "postgresql":
+            document["created_at"] = document["created_at"].replace(tzinfo=None)
+        
+        for comment in comments:
+            del comment["analysis_id"]
+        document["comments"] = comments
+        return document
@@ -0,0 +1,295 @@
+import re
+from collections import defaultdict
+from itertools import chain
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.analysis import Analysis
+from app.models.rollup import SentimentRollup
+
+
+GRANULARITIES = ("hour", "day")
+SCOPES = ("page", "post")
+COUNTERS = (
+    "analysis_count",
+    "comment_count",
+    "positive_count",
+    "neutral_count",
+    "negative_count",
+    "score_sum",
+)
+
+
+def to_naive_utc(moment: datetime) -> datetime:
+    """Convert a timestamp to naive UTC, the form rollup buckets are stored in."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its bucket, as naive UTC."""
+    moment = to_naive_utc(moment).replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def page_key_from_url(post_url: str) -> str:
+    """
+    Derive the page a post belongs to from its URL.
+    
+    Uses the page name from /{page}/posts|videos|photos/... URLs and the
+    `id` parameter of permalink.php/story.php URLs, and falls back to the
+    host for URLs without a page (reels, fb.watch, ...).
+    """
+    parsed = urlparse(post_url)
+    
+    page_id = parse_qs(parsed.query).get("id", [None])[0]
+    if page_id:
+        return page_id
+    
+    match = re.match(r'/([^/]+)/(?:posts|videos|photos)/', parsed.path)
+    if match:
+        return match.group(1)
+    
+    return parsed.netloc.lower() or "unknown"
+
+
+class RollupService:
+    """
+    Service for pre-aggregated sentiment statistics.
+    
+    Every stored analysis adds its counts to hourly and daily buckets per
+    page and per post, so trend and top-N queries read a bounded number of
+    rollup rows instead of scanning analyses.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _increments(self, analysis: Analysis) -> Iterator[Tuple[Dict, Dict]]:
+        """Yield (bucket key, counter increments) pairs for an analysis."""
+        total_comments = analysis.total_comments or 0
+        counters = {
+            "analysis_count": 1,
+            "comment_count": total_comments,
+            "positive_count": analysis.positive_count or 0,
+            "neutral_count": analysis.neutral_count or 0,
+            "negative_count": analysis.negative_count or 0,
+            "score_sum": (analysis.overall_score or 0.0) * total_comments,
+        }
+        keys = {
+            "page": page_key_from_url(analysis.post_url)[:500],
+            "post": analysis.post_url[:500],
+        }
+        created_at = analysis.created_at or datetime.now(timezone.utc)
+        
+        for granularity in GRANULARITIES:
+            for scope in SCOPES:
+                bucket = {
+                    "granularity": granularity,
+                    "scope": scope,
+                    "key": keys[scope],
+                    "bucket_start": bucket_start(created_at, granularity),
+                    "user_id": analysis.user_id or 0,
+                }
+                yield bucket, counters
+    
+    def apply_analysis(self, analysis: Analysis) -> None:
+        """
+        Add an analysis to its rollup buckets.
+        
+        Runs in the caller's transaction, so the rollups are committed
+        together with the analysis.
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+        
+        for bucket, counters in self._increments(analysis):
+            if dialect_insert is not None:
+                # Atomic upsert, safe with concurrent writers
+                stmt = dialect_insert(SentimentRollup).values(**bucket, **counters)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(bucket),
+                    set_={
+                        name: getattr(SentimentRollup, name) + stmt.excluded[name]
+                        for name in COUNTERS
+                    }
+                )
+                self.db.execute(stmt)
+                continue
+            
+            # Other databases: read-modify-write
+            rollup = self.db.execute(
+                select(SentimentRollup).filter_by(**bucket).with_for_update()
+            ).scalar_one_or_none()
+            if rollup is None:
+                self.db.add(SentimentRollup(**bucket, **counters))
+            else:
+                for name, value in counters.items():
+                    setattr(rollup, name, getattr(rollup, name) + value)
+    
+    def backfill(self, batch_size: int = 1000) -> int:
+        """
+        Rebuild all rollups from the stored analyses, archived ones included.
+        
+        The delete, scan and insert run in one transaction that holds the
+        rollup write lock from the start, so analyses saved meanwhile wait
+        for the rebuild and are then added on top of it instead of being
+        lost. On SQLite the whole database is write-locked while this runs,
+        and writers give up after the driver's busy timeout, so run it when
+        few analyses are being saved. On databases other than SQLite and
+        PostgreSQL nothing is locked and the app must be stopped first.
+        
+        Returns:
+            The number of analyses processed
+        """
+        totals: Dict[Tuple, Dict] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        processed = 0
+        
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                # Blocks apply_analysis upserts (ROW EXCLUSIVE) but not reads
+                self.db.execute(text("LOCK TABLE sentiment_rollups IN EXCLUSIVE MODE"))
+            # Deleting first also takes SQLite's write lock before the scan
+            self.db.execute(delete(SentimentRollup))
+            
+            # Archived analyses keep counting towards the rollups
+            from app.services.retention import RetentionService
+            archived = (Analysis(**row) for row in RetentionService(self.db).iter_archived_analyses())
+            live = self.db.execute(
+                select(Analysis).execution_options(yield_per=batch_size)
+            ).scalars()
+            for analysis in chain(live, archived):
+                for bucket, counters in self._increments(analysis):
+                    row = totals[tuple(bucket.items())]
+                    for name, value in counters.items():
+                        row[name] += value
+                processed += 1
+            
+            rows = [{**dict(bucket), **counters} for bucket, counters in totals.items()]
+            for i in range(0, len(rows), batch_size):
+                self.db.execute(insert(SentimentRollup), rows[i:i + batch_size])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return processed
+    
+    def _summary_columns(self):
+        return [
+            func.sum(SentimentRollup.analysis_count).label("analysis_count"),
+            func.sum(SentimentRollup.comment_count).label("comment_count"),
+            func.sum(SentimentRollup.positive_count).label("positive_count"),
+            func.sum(SentimentRollup.neutral_count).label("neutral_count"),
+            func.sum(SentimentRollup.negative_count).label("negative_count"),
+            func.sum(SentimentRollup.score_sum).label("score_sum"),
+        ]
+    
+    def _with_average(self, row) -> Dict:
+        data = dict(row._mapping)
+        comment_count = data["comment_count"] or 0
+        data["average_score"] = data["score_sum"] / comment_count if comment_count else None
+        return data
+    
+    def trend(
+        self,
+        scope: str,
+        key: str,
+        granularity: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        user_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Get sentiment totals per bucket for one page or post.
+        
+        Args:
+            scope: "page" or "post"
+            key: Page name/ID or post URL
+            granularity: "hour" or "day"
+            start: Only include buckets starting at or after this time
+            end: Only include buckets starting before this time
+            user_id: Only include analyses of this user (all users if None)
+        
+        Raises:
+            ValueError: If scope or granularity is invalid
+        """
+        self._validate(scope, granularity)
+        stmt = (
+            select(SentimentRollup.bucket_start, *self._summary_columns())
+            .where(
+                SentimentRollup.granularity == granularity,
+                SentimentRollup.scope == scope,
+                SentimentRollup.key == key,
+            )
+            .group_by(SentimentRollup.bucket_start)
+            .order_by(SentimentRollup.bucket_start)
+        )
+        stmt = self._filter(stmt, start, end, user_id)
+        return [self._with_average(row) for row in self.db.execute(stmt)]
+    
+    def top(
+        self,
+        scope: str,
+        granularity: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        metric: str = "comment_count",
+        limit: int = 10,
+        user_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Get the pages or posts with the highest total for a counter.
+        
+        Args:
+            scope: "page" or "post"
+            granularity: Rollup granularity to read ("hour" or "day")
+            start: Only include buckets starting at or after this time
+            end: Only include buckets starting before this time
+            metric: One of COUNTERS to rank by
+            limit: Maximum number of results
+            user_id: Only include analyses of this user (all users if None)
+        
+        Raises:
+            ValueError: If scope, granularity or metric is invalid
+        """
+        self._validate(scope, granularity)
+        if metric not in COUNTERS:
+            raise ValueError(f"metric must be one of: {', '.join(COUNTERS)}")
+        columns = self._summary_columns()
+        order_column = next(c for c in columns if c.name == metric)
+        stmt = (
+            select(SentimentRollup.key, *columns)
+            .where(
+                SentimentRollup.granularity == granularity,
+                SentimentRollup.scope == scope,
+            )
+            .group_by(SentimentRollup.key)
+            .order_by(order_column.desc(), SentimentRollup.key)
+            .limit(limit)
+        )
+        stmt = self._filter(stmt, start, end, user_id)
+        return [self._with_average(row) for row in self.db.execute(stmt)]
+    
+    def _validate(self, scope: str, granularity: str) -> None:
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of: {', '.join(SCOPES)}")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    
+    def _filter(self, stmt, start, end, user_id):
+        if start is not None:
+            stmt = stmt.where(SentimentRollup.bucket_start >= to_naive_utc(start))
+        if end is not None:
+            stmt = stmt.where(SentimentRollup.bucket_start < to_naive_utc(end))
+        if user_id is not None:
+            stmt = stmt.where(SentimentRollup.user_id == user_id)
+        return stmt
@@ -0,0 +1,209 @@
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, cast, column, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.analysis import Analysis
+from app.models.comment import Comment
+
+
+# SQLite: external-content FTS5 table over comments.comment_text, kept in
+# sync by triggers so every insert (ORM or bulk) is indexed.
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+        comment_text,
+        content='comments',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO comments_fts(rowid, comment_text) VALUES (new.id, new.comment_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, comment_text)
+        VALUES ('delete', old.id, old.comment_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF comment_text ON comments BEGIN
+        INSERT INTO comments_fts(comments_fts, rowid, comment_text)
+        VALUES ('delete', old.id, old.comment_text);
+        INSERT INTO comments_fts(rowid, comment_text) VALUES (new.id, new.comment_text);
+    END
+    """,
+]
+
+# PostgreSQL: generated tsvector column with a GIN index. The 'simple'
+# configuration is used because comments are multilingual.
+POSTGRES_FTS_DDL = [
+    """
+    ALTER TABLE comments ADD COLUMN IF NOT EXISTS comment_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', comment_text)) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_comments_comment_tsv ON comments USING GIN (comment_tsv)",
+]
+
+
+def init_search_index(bind: Engine) -> None:
+    """
+    Create the full-text index for the current database, if supported.
+    
+    Existing comments are indexed when the index is first created.
+    """
+    dialect = bind.dialect.name
+    
+    if dialect == "sqlite":
+        created = not inspect(bind).has_table("comments_fts")
+        with bind.begin() as conn:
+            for statement in SQLITE_FTS_DDL:
+                conn.execute(text(statement))
+            if created:
+                conn.execute(text("INSERT INTO comments_fts(comments_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        with bind.begin() as conn:
+            for statement in POSTGRES_FTS_DDL:
+                conn.execute(text(statement))
+
+
+def encode_cursor(rank: float, comment_id: int) -> str:
+    """Encode a keyset pagination cursor."""
+    raw = json.dumps([rank, comment_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a keyset pagination cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        rank, comment_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(rank), int(comment_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class SearchService:
+    """Service for full-text search over stored comments."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+    
+    def _match(self, query: str):
+        """
+        Build the text-match condition and relevance rank for a query.
+        
+        The rank is normalized so that lower is more relevant on every
+        dialect, which keeps ordering and keyset pagination uniform.
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        
+        if self.dialect == "sqlite":
+            fts = table("comments_fts", column("rowid"))
+            # Quote every term so user input is never parsed as FTS5 syntax
+            match_query = " ".join(f'"{term}"' for term in terms)
+            condition = text("comments_fts MATCH :match_query").bindparams(match_query=match_query)
+            rank = func.bm25(literal_column("comments_fts"))
+            return fts, Comment.id == fts.c.rowid, condition, rank
+        
+        if self.dialect == "postgresql":
+            tsquery = func.plainto_tsquery("simple", " ".join(terms))
+            tsv = literal_column("comments.comment_tsv")
+            # ts_rank_cd returns real; widen it so the rank in a cursor
+            # compares equal to the row it came from
+            rank = cast(-func.ts_rank_cd(tsv, tsquery), Float(precision=53))
+            return None, None, tsv.op("@@")(tsquery), rank
+        
+        # No full-text index: fall back to matching every term, unranked
+        condition = and_(*[Comment.comment_text.ilike(f"%{term}%") for term in terms])
+        return None, None, condition, literal_column("0.0")
+    
+    def search_comments(
+        self,
+        query: str,
+        sentiment: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Search comments by text, ordered by relevance.
+        
+        Args:
+            query: Words that must all appear in the comment
+            sentiment: Only include comments with this sentiment
+            min_score: Only include comments with score >= min_score
+            max_score: Only include comments with score <= max_score
+            start: Only include analyses created at or after this time
+            end: Only include analyses created before this time
+            limit: Maximum number of results
+            cursor: Cursor returned by the previous page
+        
+        Returns:
+            A tuple of (results, next_cursor). next_cursor is None on the last page.
+        
+        Raises:
+            ValueError: If the query or cursor is invalid
+        """
+        fts, fts_join, condition, rank = self._match(query)
+        
+        stmt = select(
+            Comment.id,
+            Comment.analysis_id,
+            Comment.comment_text,
+            Comment.sentiment,
+            Comment.score,
+            Analysis.created_at.label("analysis_created_at"),
+            rank.label("rank"),
+        )
+        if fts is not None:
+            stmt = stmt.select_from(fts).join(Comment, fts_join)
+        stmt = stmt.join(Analysis, Analysis.id == Comment.analysis_id).where(condition)
+        
+        if sentiment is not None:
+            stmt = stmt.where(Comment.sentiment == sentiment)
+        if min_score is not None:
+            stmt = stmt.where(Comment.score >= min_score)
+        if max_score is not None:
+            stmt = stmt.where(Comment.score <= max_score)
+        if start is not None:
+            stmt = stmt.where(Analysis.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(Analysis.created_at < end)
+        
+        ranked = stmt.subquery()
+        page = select(ranked)
+        if cursor is not None:
+            after_rank, after_id = decode_cursor(cursor)
+            page = page.where(or_(
+                ranked.c.rank > after_rank,
+                and_(ranked.c.rank == after_rank, ranked.c.id > after_id)
+            ))
+        page = page.order_by(ranked.c.rank, ranked.c.id).limit(limit + 1)
+        
+        rows = [dict(row._mapping) for row in self.db.execute(page)]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+        
+        return rows, next_cursor
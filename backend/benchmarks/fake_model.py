@@ -0,0 +1,45 @@
+import hashlib
+import time
+
+from app.ai.registry import LoadedModel
+from app.ai.sentiment import SentimentAnalyzer
+
+
+class FakePipeline:
+    """
+    Deterministic stand-in for the HuggingFace pipeline.
+    
+    Scores are derived from a hash of the text so the same input always
+    gets the same label. An optional per-text delay simulates inference cost.
+    """
+    
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+    
+    def _score(self, text: str):
+        digest = hashlib.md5(text.encode("utf-8")).digest()
+        best = digest[0] % 5 + 1
+        scores = []
+        for stars in range(1, 6):
+            score = 0.6 if stars == best else 0.1
+            scores.append({"label": f"{stars} star" + ("" if stars == 1 else "s"), "score": score})
+        return scores
+    
+    def __call__(self, inputs, **kwargs):
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if self.latency:
+            time.sleep(self.latency * len(inputs))
+        return [self._score(text) for text in inputs]
+
+
+class FakeSentimentAnalyzer(SentimentAnalyzer):
+    """SentimentAnalyzer backed by FakePipeline instead of a registry model."""
+    
+    def __init__(self, latency_ms: float = 0.0):
+        self.model_name = "stub"
+        self.language_models = {}
+        self._fake_model = LoadedModel("stub", "stub", "1", FakePipeline(latency_ms))
+    
+    def _load(self, model_name):
+        return self._fake_model
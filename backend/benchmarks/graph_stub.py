@@ -0,0 +1,75 @@
+import random
+import time
+from typing import List
+from urllib.parse import urlencode
+
+import httpx
+
+
+WORDS = [
+    "great", "love", "awesome", "terrible", "refund", "bad", "okay", "service",
+    "product", "thanks", "worst", "best", "delivery", "late", "price", "quality",
+    "merci", "super", "nul", "génial", "شكرا", "رائع", "سيء", "!!", "?", ":)",
+]
+
+
+def generate_comments(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate deterministic synthetic comments.
+    
+    Comments vary in length and include URLs and extra whitespace so that
+    clean_text has real work to do.
+    """
+    rng = random.Random(seed)
+    comments = []
+    for i in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(3, 60))]
+        if i % 7 == 0:
+            words.append("https://example.com/item/%d" % i)
+        if i % 11 == 0:
+            words.insert(0, "   ")
+        comments.append(" ".join(words))
+    return comments
+
+
+class GraphAPIStub:
+    """
+    Local stand-in for the Facebook Graph API.
+    
+    Serves a single post's comments page by page, the way
+    AnalysisService.fetch_comments consumes them, with an optional
+    per-request latency. Use `transport` as the httpx transport.
+    """
+    
+    def __init__(self, comment_count: int, latency_ms: float = 0.0, page_size: int = 100, seed: int = 0):
+        self.comments = generate_comments(comment_count, seed=seed)
+        self.latency = latency_ms / 1000.0
+        self.page_size = page_size
+        self.request_count = 0
+        self.transport = httpx.MockTransport(self._handle)
+    
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        
+        path = request.url.path.rstrip("/")
+        
+        if path.endswith("/comments"):
+            return self._comments_page(request, path)
+        
+        # Page name → page ID lookups
+        return httpx.Response(200, json={"id": "1000000000"})
+    
+    def _comments_page(self, request: httpx.Request, path: str) -> httpx.Response:
+        offset = int(request.url.params.get("after", 0))
+        page = self.comments[offset:offset + self.page_size]
+        
+        body = {"data": [{"id": str(offset + i), "message": m} for i, m in enumerate(page)]}
+        
+        next_offset = offset + len(page)
+        if next_offset < len(self.comments):
+            query = urlencode({"after": next_offset, "access_token": "stub"})
+            body["paging"] = {"next": f"https://graph.facebook.com{path}?{query}"}
+        
+        return httpx.Response(200, json=body)
@@ -0,0 +1,233 @@
+"""
+End-to-end benchmark for the analysis pipeline.
+
+Replays synthetic Graph API comment pages through a local stub transport
+and measures AnalysisService.analyze_post as a whole and per stage
+(fetch, clean, analyze, persist).
+
+Usage (from the backend directory):
+    python -m benchmarks.run --sizes 100,1000 --latency-ms 0,50 --output bench.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.ai.preprocessing import preprocessing_metrics
+from app.config import settings
+from app.database import init_db
+from app.services.analysis import AnalysisService
+from benchmarks.fake_model import FakeSentimentAnalyzer
+from benchmarks.graph_stub import GraphAPIStub
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+POST_URL = "https://www.facebook.com/BenchPage/posts/1234567890"
+STAGES = ["fetch", "clean", "analyze", "persist"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def summarize(timings: List[float], items: int) -> Dict:
+    total = sum(timings)
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": total / len(timings) * 1000 if timings else 0.0,
+        "throughput_per_s": items * len(timings) / total if total > 0 else None,
+    }
+
+
+def run_case(session_factory, analyzer, size: int, latency_ms: float, iterations: int, warmup: int) -> Dict:
+    """Benchmark one (post size, latency) combination."""
+    stub = GraphAPIStub(size, latency_ms=latency_ms)
+    
+    end_to_end: List[float] = []
+    stage_timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    comment_count = 0
+    
+    for i in range(warmup + iterations):
+        if i == warmup:
+            preprocessing_metrics.reset()
+        
+        measured = i >= warmup
+        
+        # Full path
+        db = session_factory()
+        try:
+            service = AnalysisService(db, sentiment_analyzer=analyzer, transport=stub.transport)
+            start = time.perf_counter()
+            analysis = service.analyze_post(POST_URL)
+            elapsed = time.perf_counter() - start
+            comment_count = analysis.total_comments
+        finally:
+            db.close()
+        if measured:
+            end_to_end.append(elapsed)
+        
+        # Each stage separately
+        db = session_factory()
+        try:
+            service = AnalysisService(db, sentiment_analyzer=analyzer, transport=stub.transport)
+            
+            start = time.perf_counter()
+            raw_comments = service.fetch_comments(POST_URL)
+            fetched = time.perf_counter()
+            cleaned_comments = service.clean_comments(raw_comments)
+            cleaned = time.perf_counter()
+            results = analyzer.analyze_batch(cleaned_comments)
+            analyzed = time.perf_counter()
+            service.save_analysis(POST_URL, cleaned_comments, results)
+            persisted = time.perf_counter()
+        finally:
+            db.close()
+        if measured:
+            stage_timings["fetch"].append(fetched - start)
+            stage_timings["clean"].append(cleaned - fetched)
+            stage_timings["analyze"].append(analyzed - cleaned)
+            stage_timings["persist"].append(persisted - analyzed)
+    
+    stages = {stage: summarize(timings, comment_count) for stage, timings in stage_timings.items()}
+    # One analysis row plus one row per comment
+    rows = comment_count + 1
+    persist_total = sum(stage_timings["persist"])
+    stages["persist"]["db_rows_per_s"] = rows * iterations / persist_total if persist_total > 0 else None
+    
+    return {
+        "requested_comments": size,
+        "comments": comment_count,
+        "latency_ms": latency_ms,
+        "iterations": iterations,
+        "end_to_end": summarize(end_to_end, comment_count),
+        "stages": stages,
+        "preprocessing": preprocessing_metrics.snapshot(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_analyzer(model: str, model_latency_ms: float):
+    if model == "real":
+        from app.ai.sentiment import SentimentAnalyzer
+        return SentimentAnalyzer()
+    return FakeSentimentAnalyzer(latency_ms=model_latency_ms)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline end to end.")
+    parser.add_argument("--sizes", default="100,500,1000",
+                        help="Comma-separated post sizes (comment counts)")
+    parser.add_argument("--latency-ms", default="0",
+                        help="Comma-separated Graph API latencies per request, in ms")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--model", choices=["stub", "real"], default="stub",
+                        help="Use a deterministic stub or the configured SENTIMENT_MODEL")
+    parser.add_argument("--model-latency-ms", type=float, default=0.0,
+                        help="Simulated inference time per comment for the stub model")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to write to (defaults to a temporary SQLite file)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    latencies = [float(s) for s in args.latency_ms.split(",") if s]
+    
+    # fetch_comments refuses to run without a token; the stub ignores it
+    settings.FACEBOOK_ACCESS_TOKEN = settings.FACEBOOK_ACCESS_TOKEN or "benchmark-token"
+    
+    tmpdir = None
+    database_url = args.database_url
+    if database_url is None:
+        tmpdir = tempfile.mkdtemp(prefix="sentiment-bench-")
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    init_db(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    analyzer = build_analyzer(args.model, args.model_latency_ms)
+    
+    results = []
+    for size in sizes:
+        for latency in latencies:
+            case = run_case(session_factory, analyzer, size, latency, args.iterations, args.warmup)
+            results.append(case)
+            print(
+                f"comments={case['comments']:>6} latency={latency:>6.1f}ms "
+                f"e2e p50={case['end_to_end']['p50_ms']:.1f}ms p99={case['end_to_end']['p99_ms']:.1f}ms "
+                f"persist={case['stages']['persist']['db_rows_per_s'] or 0:.0f} rows/s",
+                file=sys.stderr
+            )
+    
+    engine.dispose()
+    if tmpdir:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": args.model if args.model == "stub" else settings.SENTIMENT_MODEL,
+            "database": "sqlite (temporary)" if tmpdir else engine.dialect.name,
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    
+    return report
+
+
+if __name__ == "__main__":
+    main()
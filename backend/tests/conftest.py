@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+# app.database creates its engine on import; keep it out of the working directory
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sentiment-tests-"), "app.db")
+)
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import get_db, init_db
+from app.models.analysis import Analysis
+from app.services.analysis import AnalysisService
+from app.services.response_cache import analysis_response_cache
+from benchmarks.fake_model import FakeSentimentAnalyzer
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A fresh SQLite database per test, with the archive in tmp_path."""
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    analysis_response_cache.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    analysis_response_cache.clear()
+
+
+@pytest.fixture
+def make_analysis(db):
+    """Store an analysis of the given comments, scored by the fake model."""
+    analyzer = FakeSentimentAnalyzer()
+    
+    def make(post_url, comments, created_at=None):
+        analysis = AnalysisService(db, sentiment_analyzer=analyzer).save_analysis(
+            post_url, comments, analyzer.analyze_batch(comments)
+        )
+        if created_at is not None:
+            db.execute(update(Analysis).where(Analysis.id == analysis.id).values(created_at=created_at))
+            db.commit()
+        return analysis.id
+    
+    return make
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import pytest
+from transformers import BertTokenizerFast
+
+from app.ai.preprocessing import Chunk, PreprocessingMetrics, Preprocessor
+from app.ai.registry import LoadedModel
+from app.config import settings
+from benchmarks.fake_model import FakeSentimentAnalyzer
+
+
+WORDS = ["good", "bad", "great", "awful", "service", "product"]
+ID2LABEL = {0: "1 star", 1: "2 stars", 2: "3 stars", 3: "4 stars", 4: "5 stars"}
+
+
+@pytest.fixture
+def tokenizer(tmp_path):
+    """A tiny word-level BERT tokenizer built from a local vocabulary."""
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS) + "\n")
+    return BertTokenizerFast(vocab_file=str(vocab), model_max_length=512)
+
+
+def make_preprocessor(tokenizer, **kwargs):
+    return Preprocessor(tokenizer, metrics=PreprocessingMetrics(), **kwargs)
+
+
+def test_short_text_is_one_window(tokenizer):
+    preprocessor = make_preprocessor(tokenizer, max_length=12, stride=3)
+    
+    assert preprocessor.window == 10
+    assert preprocessor._windows(list(range(10))) == ([list(range(10))], False)
+
+
+@pytest.mark.parametrize("length", [11, 17, 18, 24, 25, 40])
+def test_windows_overlap_by_stride_and_cover_the_text(tokenizer, length):
+    preprocessor = make_preprocessor(tokenizer, max_length=12, stride=3, max_chunks=100)
+    ids = list(range(length))
+    
+    windows, truncated = preprocessor._windows(ids)
+    
+    assert not truncated
+    assert [window[0] for window in windows] == list(range(0, len(windows) * 7, 7))
+    assert all(len(window) == 10 for window in windows[:-1])
+    for previous, current in zip(windows, windows[1:]):
+        assert previous[-3:] == current[:3]
+    # The last window ends at the last token and adds tokens beyond the stride
+    assert windows[-1][-1] == length - 1
+    assert len(windows[-1]) > 3
+
+
+def test_windows_beyond_max_chunks_are_truncated(tokenizer):
+    preprocessor = make_preprocessor(tokenizer, max_length=12, stride=3, max_chunks=2)
+    
+    windows, truncated = preprocessor._windows(list(range(40)))
+    
+    assert truncated
+    assert windows == [list(range(0, 10)), list(range(7, 17))]
+    assert preprocessor._windows(list(range(17))) == ([list(range(0, 10)), list(range(7, 17))], False)
+
+
+def test_stride_must_leave_room_for_new_tokens(tokenizer):
+    with pytest.raises(ValueError):
+        make_preprocessor(tokenizer, max_length=12, stride=10)
+
+
+def test_tokenize_chunks_long_texts(tokenizer):
+    metrics = PreprocessingMetrics()
+    preprocessor = Preprocessor(tokenizer, max_length=6, stride=1, max_chunks=2, metrics=metrics)
+    cls, sep = tokenizer.cls_token_id, tokenizer.sep_token_id
+    good, bad = tokenizer.convert_tokens_to_ids(["good", "bad"])
+    
+    chunks = preprocessor.tokenize(["good bad", "good " * 4 + "bad " * 3, "bad " * 20])
+    
+    assert [chunk.text_index for chunk in chunks] == [0, 1, 1, 2, 2]
+    assert chunks[0].input_ids == [cls, good, bad, sep]
+    assert chunks[1].input_ids == [cls, good, good, good, good, sep]
+    assert chunks[2].input_ids == [cls, good, bad, bad, bad, sep]
+    assert metrics.snapshot()["chunked_texts"] == 2
+    assert metrics.snapshot()["truncated_texts"] == 1
+
+
+def test_group_batches_chunks_of_similar_length():
+    chunks = [Chunk(i, [0] * length) for i, length in enumerate([5, 1, 4, 2, 3])]
+    
+    batches = list(Preprocessor.group(chunks, 2))
+    
+    assert [[len(chunk.input_ids) for chunk in batch] for batch in batches] == [[1, 2], [3, 4], [5]]
+
+
+def test_chunk_scores_are_averaged_by_length(tokenizer, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_TOKENS", 8)
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_STRIDE", 2)
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_CHUNKS", 10)
+    # Feed chunks to the model as plain lists instead of torch tensors
+    monkeypatch.setattr(Preprocessor, "batches", lambda self, chunks, batch_size: (
+        (batch, batch) for batch in self.group(chunks, batch_size)
+    ))
+    
+    good = tokenizer.convert_tokens_to_ids("good")
+    
+    def share_good(chunk):
+        words = chunk.input_ids[1:-1]
+        return sum(token == good for token in words) / len(words)
+    
+    analyzer = FakeSentimentAnalyzer()
+    # 5 stars with the share of "good" words in the chunk, 1 star otherwise
+    analyzer._predict = lambda model, batch: [
+        [1 - share_good(chunk), 0.0, 0.0, 0.0, share_good(chunk)] for chunk in batch
+    ]
+    pipeline = SimpleNamespace(tokenizer=tokenizer, model=SimpleNamespace(config=SimpleNamespace(id2label=ID2LABEL)))
+    model = LoadedModel("tiny", "tiny", "2", pipeline)
+    
+    texts = ["good bad good", "good " * 6 + "bad " * 8, "bad " * 6 + "good " * 3]
+    results = analyzer._score_tokenized(model, texts, batch_size=2)
+    
+    chunks = make_preprocessor(tokenizer).tokenize(texts)
+    for index, result in enumerate(results):
+        own = [chunk for chunk in chunks if chunk.text_index == index]
+        weights = [len(chunk.input_ids) for chunk in own]
+        positive = sum(w * share_good(chunk) for w, chunk in zip(weights, own)) / sum(weights)
+        
+        assert result["model"] == "tiny"
+        assert result["model_version"] == "2"
+        if positive > 0.5:
+            assert result["raw_label"] == "5 stars"
+            assert result["confidence"] == pytest.approx(positive)
+        else:
+            assert result["raw_label"] == "1 star"
+            assert result["confidence"] == pytest.approx(1 - positive)
+    
+    assert [len([c for c in chunks if c.text_index == i]) for i in range(3)] == [1, 3, 2]
+    assert [result["sentiment"] for result in results] == ["positive", "negative", "negative"]
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api import analysis as analysis_api
+from app.models.analysis import Analysis
+from app.services import profiling
+from app.services.profiling import profile_call
+
+
+def test_concurrent_profiled_calls_both_succeed():
+    started = threading.Event()
+    release = threading.Event()
+    
+    def slow():
+        started.set()
+        assert release.wait(5)
+        return "slow"
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(profile_call, True, slow)
+        assert started.wait(5)
+        try:
+            second = profile_call(True, lambda: "fast")
+        finally:
+            release.set()
+        first = first.result(5)
+    
+    assert second == ("fast", None)
+    assert first[0] == "slow"
+    assert first[1] is not None
+    # The lock is free again once the profiled call returns
+    assert profile_call(True, lambda: "again")[1] is not None
+
+
+def test_profiler_that_cannot_start_is_skipped(monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+    
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    
+    assert profile_call(True, lambda: 42) == (42, None)
+    assert not profiling._profiler_lock.locked()
+
+
+def test_failing_profile_save_keeps_the_analysis(monkeypatch, session_factory, make_analysis):
+    analysis_id = make_analysis("https://www.facebook.com/page/posts/1", ["great product"])
+    
+    def fail(analysis_id, profiler):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(analysis_api, "SessionLocal", session_factory)
+    monkeypatch.setattr(analysis_api.AnalysisService, "analyze_post",
+                        lambda self, post_url, model_name: self.db.get(Analysis, analysis_id))
+    monkeypatch.setattr(analysis_api.profile_store, "save", fail)
+    
+    response = analysis_api._run_analysis("https://www.facebook.com/page/posts/1", None, True)
+    
+    assert response.id == analysis_id
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+from transformers import BertTokenizerFast
+
+from app.ai.registry import LoadedModel, ModelRegistry, ModelSpec
+
+
+@pytest.fixture
+def tokenizer_dir(tmp_path):
+    """A tiny tokenizer saved locally, so loading it needs no network."""
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "good", "bad"]) + "\n")
+    directory = tmp_path / "tokenizer"
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(str(directory))
+    return str(directory)
+
+
+def test_failed_model_load_does_not_keep_its_tokenizer(tmp_path, tokenizer_dir):
+    spec = ModelSpec("default", str(tmp_path / "missing-model"), tokenizer_dir)
+    registry = ModelRegistry({"default": spec}, 1024 * 1024 * 1024)
+    
+    with pytest.raises((ImportError, OSError)):
+        registry.get()
+    
+    assert registry.stats()["shared_tokenizers"] == 0
+    assert registry.loads == 0
+
+
+def test_tokenizer_is_shared_while_its_model_is_resident(monkeypatch, tokenizer_dir):
+    specs = {
+        "default": ModelSpec("default", "model-a", tokenizer_dir),
+        "other": ModelSpec("other", "model-b", tokenizer_dir),
+    }
+    registry = ModelRegistry(specs, 1024 * 1024 * 1024)
+    
+    def load(spec):
+        pipeline = SimpleNamespace(tokenizer=registry._tokenizer(spec.tokenizer_id))
+        return LoadedModel(spec.name, spec.model_id, "1", pipeline, tokenizer_id=spec.tokenizer_id)
+    
+    monkeypatch.setattr(registry, "_load", load)
+    
+    first = registry.get("default")
+    second = registry.get("other")
+    
+    assert second.pipeline.tokenizer is first.pipeline.tokenizer
+    assert registry.stats()["shared_tokenizers"] == 1
+    
+    registry.evict("default")
+    assert registry.stats()["shared_tokenizers"] == 1
+    registry.evict("other")
+    assert registry.stats()["shared_tokenizers"] == 0
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select, text
+
+from app.database import init_db
+from app.models.analysis import Analysis
+from app.models.archive import ArchivedAnalysis
+from app.models.comment import Comment
+from app.models.rollup import SentimentRollup
+from app.services.retention import RetentionService
+from app.services.response_cache import analysis_response_cache
+from app.services.rollup import RollupService
+
+
+OLD = datetime(2025, 1, 15, 10, 0, 0)
+
+
+def test_archived_analysis_is_served_unchanged(client, db, make_analysis):
+    old_id = make_analysis("https://www.facebook.com/page/posts/1", ["great product", "awful service"], OLD)
+    new_id = make_analysis("https://www.facebook.com/page/posts/2", ["love it"])
+    
+    before = client.get(f"/analyses/{old_id}")
+    analysis_response_cache.clear()
+    
+    summary = RetentionService(db).archive(older_than_days=30)
+    
+    assert summary["analyses"] == 1
+    assert summary["comments"] == 2
+    assert db.get(Analysis, old_id) is None
+    assert db.execute(select(func.count()).where(Comment.analysis_id == old_id)).scalar() == 0
+    assert db.get(Analysis, new_id) is not None
+    
+    after = client.get(f"/analyses/{old_id}")
+    assert after.status_code == 200
+    assert after.content == before.content
+    assert after.headers["etag"] == before.headers["etag"]
+    assert client.get("/analyses/999").status_code == 404
+
+
+def test_archived_ids_are_not_reused(client, db, make_analysis):
+    first_id = make_analysis("https://www.facebook.com/page/posts/1", ["first"], OLD)
+    RetentionService(db).archive(older_than_days=0)
+    
+    second_id = make_analysis("https://www.facebook.com/page/posts/2", ["second"], OLD)
+    assert second_id > first_id
+    
+    summary = RetentionService(db).archive(older_than_days=0)
+    assert summary["analyses"] == 1
+    
+    assert client.get(f"/analyses/{first_id}").json()["post_url"].endswith("/posts/1")
+    assert client.get(f"/analyses/{second_id}").json()["post_url"].endswith("/posts/2")
+
+
+def test_backfill_keeps_archived_analyses(db, make_analysis):
+    make_analysis("https://www.facebook.com/page/posts/1", ["good", "bad"], OLD)
+    make_analysis("https://www.facebook.com/page/posts/2", ["fine"])
+    
+    def rollups():
+        return sorted(
+            tuple(row) for row in db.execute(select(
+                SentimentRollup.granularity, SentimentRollup.scope, SentimentRollup.key,
+                SentimentRollup.bucket_start, SentimentRollup.analysis_count, SentimentRollup.comment_count
+            ))
+        )
+    
+    # make_analysis backdates after the rollups were applied
+    RollupService(db).backfill()
+    before = rollups()
+    RetentionService(db).archive(older_than_days=30)
+    assert RollupService(db).backfill() == 2
+    assert rollups() == before
+
+
+def test_legacy_analyses_table_is_migrated(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE analyses (id INTEGER NOT NULL, user_id INTEGER, post_url VARCHAR(500) NOT NULL, "
+            "overall_sentiment VARCHAR(50), overall_score FLOAT, positive_count INTEGER, "
+            "neutral_count INTEGER, negative_count INTEGER, total_comments INTEGER, "
+            "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY (id))"
+        ))
+        conn.execute(text("INSERT INTO analyses (id, post_url) VALUES (1, 'a'), (2, 'b')"))
+    
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.execute(ArchivedAnalysis.__table__.insert().values(id=7, post_url="c", month="2025-01", part="p"))
+    # Runs again on every startup; seeds the sequence past archived IDs
+    init_db(engine)
+    
+    with engine.begin() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'analyses'")).scalar()
+        assert "AUTOINCREMENT" in ddl
+        assert conn.execute(select(Analysis.post_url).order_by(Analysis.id)).scalars().all() == ["a", "b"]
+        conn.execute(Analysis.__table__.insert().values(post_url="d"))
+        assert conn.execute(select(func.max(Analysis.id))).scalar() == 8
+    engine.dispose()
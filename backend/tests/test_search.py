@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.search import SearchService, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(-1.25, 42)) == (-1.25, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor(1.0, 2)[:-4], "WzEsIDIsIDNd"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_follow_rank_then_id_without_gaps(db, make_analysis):
+    # Identical comments tie on rank, so pages must also be split by id
+    make_analysis("https://www.facebook.com/page/posts/1", [
+        "great service", "great service", "great", "nothing to see", "great great product",
+    ])
+    make_analysis("https://www.facebook.com/page/posts/2", [
+        "great service", "great", "a long comment that says great once", "also unrelated",
+    ])
+    search = SearchService(db)
+    expected, cursor = search.search_comments("great", limit=100)
+    assert cursor is None
+    assert len(expected) == 7
+    
+    pages = []
+    cursor = None
+    while True:
+        rows, cursor = search.search_comments("great", limit=2, cursor=cursor)
+        pages.append(rows)
+        if cursor is None:
+            break
+    
+    assert [len(rows) for rows in pages] == [2, 2, 2, 1]
+    seen = [(row["rank"], row["id"]) for rows in pages for row in rows]
+    assert seen == sorted(seen)
+    assert [row["id"] for row in expected] == [comment_id for _, comment_id in seen]
+    assert len(set(rank for rank, _ in seen)) < len(seen)
+
+
+def test_postgres_rank_is_double_precision():
+    # ts_rank_cd is real; a real rank would not compare equal to its
+    # float8 cursor value, and rows tied with the cursor would be skipped
+    db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    rank = SearchService(db)._match("great service")[3]
+    
+    assert "AS FLOAT(53)" in str(rank.compile(dialect=postgresql.dialect()))